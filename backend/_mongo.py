@@ -0,0 +1,36 @@
+"""
+Shared MongoDB client factory for the one-off backend scripts.
+
+Scripts call get_client(mongo_url) instead of constructing their own client, so connection
+options (CA bundle, UUID representation, pool sizing, timeouts) stay consistent. Each call
+returns a new client owned (and closed) by the caller.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+import certifi
+from pymongo import AsyncMongoClient
+
+# Scripts issue only a handful of concurrent operations: keep a couple of warm connections
+# (so TLS handshakes are paid up front) but cap the pool to spare server-side memory.
+DEFAULT_OPTIONS = {
+    "uuidRepresentation": "standard",
+    "maxPoolSize": 4,
+    "minPoolSize": 2,
+    "serverSelectionTimeoutMS": 5000,
+    "waitQueueTimeoutMS": 5000,
+}
+
+
+def get_client(mongo_url: str, **options: Any) -> AsyncMongoClient:
+    """
+    Return a new client for `mongo_url`; the caller closes it when done.
+    Keyword options override DEFAULT_OPTIONS.
+    """
+    kwargs = {**DEFAULT_OPTIONS, **options}
+    if mongo_url.startswith("mongodb+srv://"):
+        # Atlas (SRV) connections always use TLS; validate against certifi's CA bundle.
+        kwargs.setdefault("tlsCAFile", certifi.where())
+    return AsyncMongoClient(mongo_url, **kwargs)
@@ -0,0 +1,229 @@
+"""
+Admin command-line tools for Convin Elevate (password resets and dummy-data removal).
+The reset_admin_password.py, reset_password_task.py and remove_dummy_data.py scripts are thin
+wrappers around these subcommands.
+
+Usage:
+    # Reset a user's password
+    python3 admin_cli.py reset-password --email admin@convin.ai --password admin123
+
+    # Remove all data tagged with "DUMMY_DATA"
+    python3 admin_cli.py purge-dummy
+    python3 admin_cli.py purge-dummy --skip-precount
+
+    # Use production database (same as Vercel)
+    python3 admin_cli.py purge-dummy --mongo-url "mongodb+srv://..." --db-name "elivate"
+"""
+
+import asyncio
+import argparse
+import os
+from typing import List, Optional
+
+# Only stdlib imports at module level: bcrypt, pymongo and dotenv are imported where they are
+# used, so `--help` and argument errors return without loading the driver.
+
+# Collections that may hold dummy data, with their display labels
+DUMMY_COLLECTIONS = {
+    "customers": "Customers",
+    "activities": "Activities",
+    "risks": "Risks",
+    "opportunities": "Opportunities",
+    "tasks": "Tasks",
+    "documents": "Documents",
+    "datalabs_reports": "DataLabs Reports",
+    "users": "Users",
+}
+
+# Equality on the tags array matches any element (same documents as $in) and can use an index
+DUMMY_FILTER = {"tags": "DUMMY_DATA"}
+
+# Documents deleted per delete_many; keeps each write short on large collections
+DELETE_CHUNK_SIZE = 1000
+
+
+def get_db(args, **options):
+    """Return (client, db) for the parsed command-line arguments."""
+    from _mongo import get_client
+
+    if args.insecure:
+        options["tlsAllowInvalidCertificates"] = True
+    client = get_client(args.mongo_url, **options)
+    return client, client[args.db_name]
+
+
+async def find_user(db, email, password):
+    """Look up the user by email; returns (user, True if `password` is already their password)."""
+    import bcrypt
+
+    user = await db.users.find_one({"email": email}, {"_id": 1, "password": 1})
+    if not user or not user.get("password"):
+        return user, False
+    try:
+        unchanged = await asyncio.to_thread(bcrypt.checkpw, password.encode('utf-8'), user["password"].encode('utf-8'))
+    except ValueError:
+        # Stored value is not a valid bcrypt hash
+        unchanged = False
+    return user, unchanged
+
+
+async def reset_password(args):
+    """Set a user's password (bcrypt-hashed)."""
+    import bcrypt
+
+    email = args.email
+    # bcrypt cost factor; lower it (e.g. 10) for faster local resets. The server verifies any cost.
+    # Read here rather than at import so a BCRYPT_ROUNDS set in .env is honoured.
+    rounds = int(os.environ.get("BCRYPT_ROUNDS", "12"))
+    new_password = args.password
+
+    print(f"📊 Connecting to database: {args.db_name}...")
+    client, db = get_db(args)
+
+    try:
+        # Look up (and check) first so a rerun with the same password skips hashing entirely
+        user, unchanged = await find_user(db, email, new_password)
+
+        if user and unchanged:
+            print(f"✅ Password for {email} is already set to the requested value (no changes made)")
+        elif user:
+            print(f"🔐 Hashing password for {email}...")
+            hashed = await asyncio.to_thread(bcrypt.hashpw, new_password.encode('utf-8'), bcrypt.gensalt(rounds=rounds))
+            print("🔄 Updating user record...")
+            await db.users.update_one(
+                {"_id": user["_id"]},
+                {"$set": {"password": hashed.decode('utf-8')}}
+            )
+            print(f"\n✅ Success! Password updated for {email}")
+            print(f"\n💡 You can now log in with:")
+            print(f"   Email: {email}")
+            print(f"   Password: {new_password}")
+        else:
+            print(f"❌ User with email '{email}' not found in the database.")
+
+    except Exception as e:
+        print(f"❌ An error occurred: {e}")
+        import traceback
+        traceback.print_exc()
+    finally:
+        await client.close()
+
+
+async def delete_in_chunks(collection, query) -> int:
+    """Delete documents matching `query` in batches of _ids; returns the number deleted."""
+    deleted = 0
+    ids = []
+    async for doc in collection.find(query, {"_id": 1}).batch_size(DELETE_CHUNK_SIZE):
+        ids.append(doc["_id"])
+        if len(ids) == DELETE_CHUNK_SIZE:
+            deleted += (await collection.delete_many({"_id": {"$in": ids}})).deleted_count
+            ids = []
+    if ids:
+        deleted += (await collection.delete_many({"_id": {"$in": ids}})).deleted_count
+    return deleted
+
+
+async def purge_dummy(args):
+    """Remove all dummy data from the database."""
+    from db_schema import ensure_indexes
+
+    print("=" * 60)
+    print("Removing Dummy Data")
+    print("=" * 60)
+
+    print(f"\n📊 Connecting to database: {args.db_name}")
+    print(f"   MongoDB URL: {args.mongo_url[:50]}...")
+
+    # One pooled connection per collection processed concurrently
+    client, db = get_db(args, maxPoolSize=len(DUMMY_COLLECTIONS))
+
+    try:
+        # Indexes on tags (idempotent) let the counts and deletes below avoid collection scans
+        await ensure_indexes(db, DUMMY_COLLECTIONS)
+
+        # Count before deletion
+        if args.skip_precount:
+            print("\n📊 Proceeding without precount")
+        else:
+            counts = await asyncio.gather(
+                *(db[name].count_documents(DUMMY_FILTER) for name in DUMMY_COLLECTIONS)
+            )
+
+            print(f"\n📊 Found dummy data:")
+            for label, count in zip(DUMMY_COLLECTIONS.values(), counts):
+                print(f"   - {label}: {count}")
+
+        # Confirm deletion
+        print("\n⚠️  This will permanently delete all dummy data!")
+        response = input("Type 'DELETE' to confirm: ")
+
+        if response != "DELETE":
+            print("❌ Deletion cancelled.")
+            return
+
+        # Delete dummy data
+        print("\n🗑️  Deleting dummy data...")
+
+        deleted_counts = await asyncio.gather(
+            *(delete_in_chunks(db[name], DUMMY_FILTER) for name in DUMMY_COLLECTIONS)
+        )
+
+        print("\n✅ Deletion completed!")
+        print(f"\n📊 Deleted:")
+        for label, deleted in zip(DUMMY_COLLECTIONS.values(), deleted_counts):
+            print(f"   - {label}: {deleted}")
+
+    except Exception as e:
+        print(f"\n❌ Error: {e}")
+        import traceback
+        traceback.print_exc()
+    finally:
+        await client.close()
+
+
+def build_parser() -> argparse.ArgumentParser:
+    # Connection options are accepted after the subcommand name
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('--mongo-url', type=str, help='MongoDB connection string (overrides .env)')
+    common.add_argument('--db-name', type=str, help='Database name (overrides .env)')
+    common.add_argument('--insecure', action='store_true',
+                        help='Skip TLS certificate validation (self-signed development clusters only)')
+
+    parser = argparse.ArgumentParser(description='Convin Elevate admin tools')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    reset = subparsers.add_parser('reset-password', parents=[common], help="Reset a user's password")
+    reset.add_argument('--email', type=str, required=True, help='Email of the user to update')
+    reset.add_argument('--password', type=str, required=True, help='New password')
+    reset.set_defaults(handler=reset_password)
+
+    purge = subparsers.add_parser('purge-dummy', parents=[common], help='Remove all DUMMY_DATA-tagged documents')
+    purge.add_argument('--skip-precount', action='store_true',
+                       help='Skip counting dummy documents before deletion (deleted totals are still reported)')
+    purge.set_defaults(handler=purge_dummy)
+
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = build_parser().parse_args(argv)
+
+    # Use command line args if provided, otherwise use environment variables (never overriding them)
+    from dotenv import load_dotenv
+    load_dotenv(os.path.join(os.path.dirname(__file__), '.env'), override=False)
+    args.mongo_url = args.mongo_url or os.getenv("MONGO_URL")
+    args.db_name = args.db_name or os.getenv("DB_NAME", "elivate")
+
+    if not args.mongo_url:
+        print("❌ Error: MONGO_URL is required!")
+        print("   Set it via:")
+        print("   - Command line: --mongo-url 'mongodb+srv://...'")
+        print("   - Environment variable: export MONGO_URL='mongodb+srv://...'")
+        print("   - .env file: MONGO_URL=mongodb+srv://...")
+        return
+
+    asyncio.run(args.handler(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -6,9 +6,11 @@ This makes the customers visible if you're logged in as a CSM with "own" scope.
 import asyncio
 import argparse
 import os
-from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import AsyncMongoClient
 from dotenv import load_dotenv
 
+from db_schema import ensure_indexes
+
 load_dotenv()
 
 parser = argparse.ArgumentParser(description='Assign dummy customers to a user')
@@ -29,12 +31,18 @@ async def assign_customers():
     
     print(f"📊 Connecting to database: {DB_NAME}")
     
-    client = AsyncIOMotorClient(MONGO_URL)
+    client = AsyncMongoClient(MONGO_URL)
     db = client[DB_NAME]
     
     try:
+        # users.email and customers.tags back the two queries below
+        await ensure_indexes(db, ["users", "customers"])
+        
         # Find the user
-        user = await db.users.find_one({"email": args.user_email})
+        user = await db.users.find_one(
+            {"email": args.user_email},
+            {"_id": 0, "id": 1, "name": 1, "email": 1}
+        )
         if not user:
             print(f"❌ User with email '{args.user_email}' not found!")
             return
@@ -42,17 +50,10 @@ async def assign_customers():
         print(f"✅ Found user: {user.get('name')} ({user.get('email')})")
         print(f"   User ID: {user.get('id')}")
         
-        # Count dummy customers
-        dummy_count = await db.customers.count_documents({"tags": {"$in": ["DUMMY_DATA"]}})
-        print(f"\n📊 Found {dummy_count} customers with DUMMY_DATA tag")
-        
-        if dummy_count == 0:
-            print("⚠️  No dummy customers found. Make sure you've run create_dummy_data.py first.")
-            return
-        
-        # Update all dummy customers to be assigned to this user
+        # Assign all dummy customers to this user (equality on the tags array
+        # matches the same documents as $in and can use an index on tags)
         result = await db.customers.update_many(
-            {"tags": {"$in": ["DUMMY_DATA"]}},
+            {"tags": "DUMMY_DATA"},
             {
                 "$set": {
                     "csm_owner_id": user.get("id"),
@@ -61,6 +62,11 @@ async def assign_customers():
             }
         )
         
+        print(f"\n📊 Found {result.matched_count} customers with DUMMY_DATA tag")
+        if result.matched_count == 0:
+            print("⚠️  No dummy customers found. Make sure you've run create_dummy_data.py first.")
+            return
+        
         print(f"\n✅ Successfully assigned {result.modified_count} customers to {user.get('name')}")
         print(f"\n💡 Now log in as {user.get('email')} to see all dummy customers!")
         
@@ -69,7 +75,7 @@ async def assign_customers():
         import traceback
         traceback.print_exc()
     finally:
-        client.close()
+        await client.close()
 
 
 if __name__ == "__main__":
@@ -1,7 +1,7 @@
 import os
 import asyncio
 import certifi
-from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import AsyncMongoClient
 from dotenv import load_dotenv
 
 # Load env variables from .env file
@@ -15,23 +15,31 @@ async def check_stats():
         print("Error: MONGO_URL not found")
         return
 
-    client = AsyncIOMotorClient(
+    client = AsyncMongoClient(
         MONGO_URL,
         tlsCAFile=certifi.where(),
         tls=True,
         tlsAllowInvalidCertificates=True
     )
     db = client[DB_NAME]
-    
-    collections = await db.list_collection_names()
-    print(f"Collections found: {collections}")
-    
-    for col in ["customers", "documents", "users", "activities"]:
-        if col in collections:
-            count = await db[col].count_documents({})
-            print(f"{col}: {count} records")
-        else:
-            print(f"{col}: <missing>")
+
+    try:
+        collections = await db.list_collection_names()
+        print(f"Collections found: {collections}")
+
+        wanted = ["customers", "documents", "users", "activities"]
+        present = [col for col in wanted if col in collections]
+        counts = dict(zip(present, await asyncio.gather(
+            *(db[col].estimated_document_count() for col in present)
+        )))
+
+        for col in wanted:
+            if col in counts:
+                print(f"{col}: {counts[col]} records")
+            else:
+                print(f"{col}: <missing>")
+    finally:
+        await client.close()
 
 if __name__ == "__main__":
     try:
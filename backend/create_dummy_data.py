@@ -9,6 +9,9 @@ Usage:
     # Use production database (same as Vercel)
     python3 create_dummy_data.py --mongo-url "mongodb+srv://..." --db-name "elivate"
     
+    # Faster inserts on a throwaway local database (w=1, no journal)
+    python3 create_dummy_data.py --dev
+    
     # Or set environment variables
     export MONGO_URL="mongodb+srv://..."
     export DB_NAME="elivate"
@@ -17,16 +20,19 @@ Usage:
 
 import asyncio
 import argparse
+import base64
 import os
 import random
-import secrets
 import string
 from datetime import datetime, timedelta, timezone
+from itertools import accumulate
 from typing import List, Dict, Any
 
-from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import AsyncMongoClient, UpdateOne
 from dotenv import load_dotenv
 
+from db_schema import ensure_indexes
+
 # Load environment variables from .env file
 load_dotenv()
 
@@ -34,6 +40,8 @@ load_dotenv()
 parser = argparse.ArgumentParser(description='Create dummy data for Convin Elevate')
 parser.add_argument('--mongo-url', type=str, help='MongoDB connection string (overrides .env)')
 parser.add_argument('--db-name', type=str, help='Database name (overrides .env)')
+parser.add_argument('--dev', action='store_true',
+                    help='Use w=1 without journaling for faster inserts (throwaway/local databases only)')
 args = parser.parse_args()
 
 # Use command line args if provided, otherwise use environment variables
@@ -69,6 +77,10 @@ ACCOUNT_STATUSES = ["Active", "At Risk", "Critical", "Churned", "Onboarding"]
 
 HEALTH_STATUSES = ["Healthy", "At Risk", "Critical"]
 
+RISK_LEVELS = ["Low", "Medium", "High"]
+
+STAKEHOLDER_ROLES = ["CEO", "CTO", "VP", "Director", "Manager"]
+
 ACTIVITY_TYPES = [
     "Call", "Email", "Meeting", "QBR", "Training", "Support", "Onboarding", "Check-in"
 ]
@@ -114,30 +126,56 @@ PRODUCTS = [
     "Convin AI", "Call Analytics", "Quality Assurance", "Agent Coaching", "Compliance"
 ]
 
+PRIMARY_OBJECTIVES = [
+    "Improve Customer Satisfaction", "Increase Adoption", "Reduce Churn",
+    "Expand Usage", "Renewal", "Upsell"
+]
+
+# Connection pool size: 6 concurrent bulk writers plus headroom
+POOL_SIZE = 16
+
+# Reference "now" for all generated dates (the script runs in well under a minute)
+_NOW = datetime.now(timezone.utc)
+
+
+def generate_ids(n: int) -> List[str]:
+    """Generate n UUID-like strings from a single os.urandom() read."""
+    raw = os.urandom(16 * n)
+    return [base64.urlsafe_b64encode(raw[i:i + 16]).rstrip(b"=").decode() for i in range(0, len(raw), 16)]
+
+
+_id_pool: List[str] = []
+
 
 def generate_id() -> str:
-    """Generate a UUID-like string."""
-    return secrets.token_urlsafe(16)
+    """Generate a UUID-like string (same format as secrets.token_urlsafe(16))."""
+    if not _id_pool:
+        _id_pool.extend(generate_ids(1024))
+    return _id_pool.pop()
+
+
+def random_datetime(start_days_ago: int = 365, end_days_ago: int = 0) -> datetime:
+    """Generate a random past datetime."""
+    return _NOW - timedelta(days=random.randint(end_days_ago, start_days_ago))
 
 
 def random_date(start_days_ago: int = 365, end_days_ago: int = 0) -> str:
     """Generate a random date string in ISO format."""
-    days_ago = random.randint(end_days_ago, start_days_ago)
-    date = datetime.now(timezone.utc) - timedelta(days=days_ago)
-    return date.isoformat()
+    return random_datetime(start_days_ago, end_days_ago).isoformat()
 
 
 def random_future_date(days_ahead: int = 90) -> str:
     """Generate a random future date."""
-    days = random.randint(1, days_ahead)
-    date = datetime.now(timezone.utc) + timedelta(days=days)
-    return date.isoformat()
+    return (_NOW + timedelta(days=random.randint(1, days_ahead))).isoformat()
 
 
 async def get_or_create_csm_users(db) -> List[Dict[str, Any]]:
     """Get existing CSM users or create dummy ones."""
     # Try to get existing CSM users
-    csm_users = await db.users.find({"role": "CSM", "status": "Active"}).to_list(length=10)
+    csm_users = await db.users.find(
+        {"role": "CSM", "status": "Active"},
+        {"_id": 0, "id": 1, "name": 1}
+    ).to_list(length=10)
     
     if not csm_users:
         # Create 5 dummy CSM users
@@ -157,53 +195,79 @@ async def get_or_create_csm_users(db) -> List[Dict[str, Any]]:
                 "created_at": random_date(180, 30),
                 "tags": ["DUMMY_DATA"]
             }
-            await db.users.insert_one(user)
             csm_users.append(user)
-            print(f"Created dummy CSM user: {name}")
+        # Upsert on email so re-runs reuse dummy CSMs left over from a previous run
+        await db.users.bulk_write(
+            [UpdateOne({"email": u["email"]}, {"$setOnInsert": u}, upsert=True) for u in csm_users],
+            ordered=False
+        )
+        csm_users = await db.users.find(
+            {"email": {"$in": [u["email"] for u in csm_users]}},
+            {"_id": 0, "id": 1, "name": 1}
+        ).to_list(length=None)
+        print(f"Using dummy CSM users: {', '.join(csm_names)}")
     
     return csm_users
 
 
-async def create_customers(db, csm_users: List[Dict]) -> List[str]:
+async def create_customers(db, csm_users: List[Dict]) -> List[Dict[str, Any]]:
     """Create 50 Indian customers."""
-    customer_ids = []
+    customers = []
+    companies = INDIAN_COMPANIES[:50]
+    n = len(companies)
     
-    for i, company in enumerate(INDIAN_COMPANIES[:50]):
-        csm = random.choice(csm_users)
-        health_score = random.randint(30, 100)
+    # Draw each field's random values for all customers up front (one call per field)
+    csms = random.choices(csm_users, k=n)
+    health_scores = random.choices(range(30, 101), k=n)
+    industries = random.choices(INDUSTRIES, k=n)
+    regions = random.choices(REGIONS, k=n)
+    plan_types = random.choices(PLAN_TYPES, k=n)
+    onboarding_statuses = random.choices(ONBOARDING_STATUSES, k=n)
+    account_statuses = random.choices(ACCOUNT_STATUSES, k=n)
+    primary_objectives = random.choices(PRIMARY_OBJECTIVES, k=n)
+    calls_processed = random.choices(range(1000, 100001), k=n)
+    active_users = random.choices(range(10, 501), k=n)
+    total_licensed_users = random.choices(range(20, 1001), k=n)
+    # 1-3 stakeholders per customer; customer i owns entries [offsets[i], offsets[i+1])
+    stakeholder_counts = random.choices(range(1, 4), k=n)
+    offsets = [0, *accumulate(stakeholder_counts)]
+    stakeholder_roles = random.choices(STAKEHOLDER_ROLES, k=offsets[-1])
+    stakeholder_phones = random.choices(range(9000000000, 10000000000), k=offsets[-1])
+    
+    for i, company in enumerate(companies):
+        csm = csms[i]
+        slug = company.lower().replace(' ', '')
+        health_score = health_scores[i]
         health_status = "Healthy" if health_score >= 70 else ("At Risk" if health_score >= 50 else "Critical")
         
-        contract_start = random_date(730, 30)
-        contract_end = (datetime.fromisoformat(contract_start.replace('Z', '+00:00')) + timedelta(days=365)).isoformat()
-        renewal_date = (datetime.fromisoformat(contract_end.replace('Z', '+00:00')) - timedelta(days=90)).isoformat()
+        contract_start = random_datetime(730, 30)
+        contract_end = contract_start + timedelta(days=365)
+        renewal_date = contract_end - timedelta(days=90)
         
         customer = {
             "id": generate_id(),
             "company_name": company,
-            "website": f"https://www.{company.lower().replace(' ', '')}.com",
-            "industry": random.choice(INDUSTRIES),
-            "region": random.choice(REGIONS),
-            "plan_type": random.choice(PLAN_TYPES),
+            "website": f"https://www.{slug}.com",
+            "industry": industries[i],
+            "region": regions[i],
+            "plan_type": plan_types[i],
             "arr": round(random.uniform(50000, 500000), 2),
             "one_time_setup_cost": round(random.uniform(10000, 50000), 2),
             "quarterly_consumption_cost": round(random.uniform(5000, 25000), 2),
-            "contract_start_date": contract_start,
-            "contract_end_date": contract_end,
-            "renewal_date": renewal_date,
+            "contract_start_date": contract_start.isoformat(),
+            "contract_end_date": contract_end.isoformat(),
+            "renewal_date": renewal_date.isoformat(),
             "go_live_date": random_date(365, 60),
             "products_purchased": random.sample(PRODUCTS, random.randint(1, 3)),
-            "onboarding_status": random.choice(ONBOARDING_STATUSES),
-            "account_status": random.choice(ACCOUNT_STATUSES),
+            "onboarding_status": onboarding_statuses[i],
+            "account_status": account_statuses[i],
             "health_score": health_score,
             "health_status": health_status,
-            "risk_level": random.choice(["Low", "Medium", "High"]) if health_score < 70 else "Low",
-            "primary_objective": random.choice([
-                "Improve Customer Satisfaction", "Increase Adoption", "Reduce Churn",
-                "Expand Usage", "Renewal", "Upsell"
-            ]),
-            "calls_processed": random.randint(1000, 100000),
-            "active_users": random.randint(10, 500),
-            "total_licensed_users": random.randint(20, 1000),
+            "risk_level": random.choice(RISK_LEVELS) if health_score < 70 else "Low",
+            "primary_objective": primary_objectives[i],
+            "calls_processed": calls_processed[i],
+            "active_users": active_users[i],
+            "total_licensed_users": total_licensed_users[i],
             "csm_owner_id": csm["id"],
             "csm_owner_name": csm["name"],
             "am_owner_id": None,
@@ -212,29 +276,29 @@ async def create_customers(db, csm_users: List[Dict]) -> List[str]:
             "stakeholders": [
                 {
                     "name": f"Contact {j+1}",
-                    "email": f"contact{j+1}@{company.lower().replace(' ', '')}.com",
-                    "role": random.choice(["CEO", "CTO", "VP", "Director", "Manager"]),
-                    "phone": f"+91-{random.randint(9000000000, 9999999999)}"
+                    "email": f"contact{j+1}@{slug}.com",
+                    "role": stakeholder_roles[offsets[i] + j],
+                    "phone": f"+91-{stakeholder_phones[offsets[i] + j]}"
                 }
-                for j in range(random.randint(1, 3))
+                for j in range(stakeholder_counts[i])
             ],
             "last_activity_date": random_date(30, 0),
             "created_at": random_date(365, 30),
             "updated_at": random_date(30, 0)
         }
         
-        await db.customers.insert_one(customer)
-        customer_ids.append(customer["id"])
-        print(f"Created customer {i+1}/50: {company}")
+        customers.append(customer)
     
-    return customer_ids
+    await db.customers.insert_many(customers, ordered=False)
+    print(f"Created {len(customers)} customers")
+    return customers
 
 
-async def create_activities(db, customer_ids: List[str], csm_users: List[Dict]):
+async def create_activities(db, customers: List[Dict], csm_users: List[Dict]):
     """Create activities for each customer."""
-    activity_count = 0
+    activities = []
     
-    for customer_id in customer_ids:
+    for customer in customers:
         # 3-8 activities per customer
         num_activities = random.randint(3, 8)
         
@@ -244,8 +308,8 @@ async def create_activities(db, customer_ids: List[str], csm_users: List[Dict]):
             
             activity = {
                 "id": generate_id(),
-                "customer_id": customer_id,
-                "customer_name": None,  # Will be populated by API
+                "customer_id": customer["id"],
+                "customer_name": customer["company_name"],
                 "activity_type": activity_type,
                 "activity_date": random_date(90, 0),
                 "title": f"{activity_type} - {random.choice(['Follow-up', 'Check-in', 'QBR', 'Training', 'Support'])}",
@@ -261,19 +325,19 @@ async def create_activities(db, customer_ids: List[str], csm_users: List[Dict]):
                 "tags": ["DUMMY_DATA"]
             }
             
-            await db.activities.insert_one(activity)
-            activity_count += 1
+            activities.append(activity)
     
-    print(f"Created {activity_count} activities")
+    await db.activities.insert_many(activities, ordered=False)
+    print(f"Created {len(activities)} activities")
 
 
-async def create_risks(db, customer_ids: List[str], csm_users: List[Dict]):
+async def create_risks(db, customers: List[Dict], csm_users: List[Dict]):
     """Create risks for some customers."""
-    risk_count = 0
+    risks = []
     # 30-40% of customers have risks
-    customers_with_risks = random.sample(customer_ids, random.randint(15, 20))
+    customers_with_risks = random.sample(customers, random.randint(15, 20))
     
-    for customer_id in customers_with_risks:
+    for customer in customers_with_risks:
         # 1-3 risks per customer
         num_risks = random.randint(1, 3)
         
@@ -285,8 +349,8 @@ async def create_risks(db, customer_ids: List[str], csm_users: List[Dict]):
             
             risk = {
                 "id": generate_id(),
-                "customer_id": customer_id,
-                "customer_name": None,
+                "customer_id": customer["id"],
+                "customer_name": customer["company_name"],
                 "category": category,
                 "subcategory": subcategory,
                 "severity": severity,
@@ -307,19 +371,19 @@ async def create_risks(db, customer_ids: List[str], csm_users: List[Dict]):
                 "tags": ["DUMMY_DATA"]
             }
             
-            await db.risks.insert_one(risk)
-            risk_count += 1
+            risks.append(risk)
     
-    print(f"Created {risk_count} risks")
+    await db.risks.insert_many(risks, ordered=False)
+    print(f"Created {len(risks)} risks")
 
 
-async def create_opportunities(db, customer_ids: List[str], csm_users: List[Dict]):
+async def create_opportunities(db, customers: List[Dict], csm_users: List[Dict]):
     """Create opportunities for some customers."""
-    opp_count = 0
+    opportunities = []
     # 40-50% of customers have opportunities
-    customers_with_opps = random.sample(customer_ids, random.randint(20, 25))
+    customers_with_opps = random.sample(customers, random.randint(20, 25))
     
-    for customer_id in customers_with_opps:
+    for customer in customers_with_opps:
         # 1-2 opportunities per customer
         num_opps = random.randint(1, 2)
         
@@ -329,8 +393,8 @@ async def create_opportunities(db, customer_ids: List[str], csm_users: List[Dict
             
             opportunity = {
                 "id": generate_id(),
-                "customer_id": customer_id,
-                "customer_name": None,
+                "customer_id": customer["id"],
+                "customer_name": customer["company_name"],
                 "opportunity_type": opp_type,
                 "title": f"{opp_type} Opportunity",
                 "description": f"{opp_type} opportunity with potential value.",
@@ -345,17 +409,17 @@ async def create_opportunities(db, customer_ids: List[str], csm_users: List[Dict
                 "tags": ["DUMMY_DATA"]
             }
             
-            await db.opportunities.insert_one(opportunity)
-            opp_count += 1
+            opportunities.append(opportunity)
     
-    print(f"Created {opp_count} opportunities")
+    await db.opportunities.insert_many(opportunities, ordered=False)
+    print(f"Created {len(opportunities)} opportunities")
 
 
-async def create_tasks(db, customer_ids: List[str], csm_users: List[Dict]):
+async def create_tasks(db, customers: List[Dict], csm_users: List[Dict]):
     """Create tasks for customers."""
-    task_count = 0
+    tasks = []
     
-    for customer_id in customer_ids:
+    for customer in customers:
         # 2-5 tasks per customer
         num_tasks = random.randint(2, 5)
         
@@ -369,8 +433,8 @@ async def create_tasks(db, customer_ids: List[str], csm_users: List[Dict]):
             
             task = {
                 "id": generate_id(),
-                "customer_id": customer_id,
-                "customer_name": None,
+                "customer_id": customer["id"],
+                "customer_name": customer["company_name"],
                 "task_type": task_type,
                 "title": f"{task_type} Task",
                 "description": f"Task description for {task_type.lower()}.",
@@ -387,19 +451,19 @@ async def create_tasks(db, customer_ids: List[str], csm_users: List[Dict]):
                 "tags": ["DUMMY_DATA"]
             }
             
-            await db.tasks.insert_one(task)
-            task_count += 1
+            tasks.append(task)
     
-    print(f"Created {task_count} tasks")
+    await db.tasks.insert_many(tasks, ordered=False)
+    print(f"Created {len(tasks)} tasks")
 
 
-async def create_documents(db, customer_ids: List[str], csm_users: List[Dict]):
+async def create_documents(db, customers: List[Dict], csm_users: List[Dict]):
     """Create documents for customers."""
-    doc_count = 0
+    documents = []
     # 60-70% of customers have documents
-    customers_with_docs = random.sample(customer_ids, random.randint(30, 35))
+    customers_with_docs = random.sample(customers, random.randint(30, 35))
     
-    for customer_id in customers_with_docs:
+    for customer in customers_with_docs:
         # 1-4 documents per customer
         num_docs = random.randint(1, 4)
         
@@ -409,7 +473,7 @@ async def create_documents(db, customer_ids: List[str], csm_users: List[Dict]):
             
             document = {
                 "id": generate_id(),
-                "customer_id": customer_id,
+                "customer_id": customer["id"],
                 "document_type": doc_type,
                 "title": f"{doc_type} Document",
                 "description": f"{doc_type} document for customer.",
@@ -422,19 +486,19 @@ async def create_documents(db, customer_ids: List[str], csm_users: List[Dict]):
                 "tags": ["DUMMY_DATA"]
             }
             
-            await db.documents.insert_one(document)
-            doc_count += 1
+            documents.append(document)
     
-    print(f"Created {doc_count} documents")
+    await db.documents.insert_many(documents, ordered=False)
+    print(f"Created {len(documents)} documents")
 
 
-async def create_datalabs_reports(db, customer_ids: List[str], csm_users: List[Dict]):
+async def create_datalabs_reports(db, customers: List[Dict], csm_users: List[Dict]):
     """Create DataLabs reports for customers."""
-    report_count = 0
+    reports = []
     # 50-60% of customers have reports
-    customers_with_reports = random.sample(customer_ids, random.randint(25, 30))
+    customers_with_reports = random.sample(customers, random.randint(25, 30))
     
-    for customer_id in customers_with_reports:
+    for customer in customers_with_reports:
         # 1-3 reports per customer
         num_reports = random.randint(1, 3)
         
@@ -444,8 +508,8 @@ async def create_datalabs_reports(db, customer_ids: List[str], csm_users: List[D
             
             report = {
                 "id": generate_id(),
-                "customer_id": customer_id,
-                "customer_name": None,
+                "customer_id": customer["id"],
+                "customer_name": customer["company_name"],
                 "report_date": random_date(180, 0),
                 "report_title": f"{report_type} - {random_date(30, 0)[:10]}",
                 "report_link": f"https://example.com/reports/{generate_id()}.pdf",
@@ -458,10 +522,10 @@ async def create_datalabs_reports(db, customer_ids: List[str], csm_users: List[D
                 "tags": ["DUMMY_DATA"]
             }
             
-            await db.datalabs_reports.insert_one(report)
-            report_count += 1
+            reports.append(report)
     
-    print(f"Created {report_count} DataLabs reports")
+    await db.datalabs_reports.insert_many(reports, ordered=False)
+    print(f"Created {len(reports)} DataLabs reports")
 
 
 async def main():
@@ -482,10 +546,20 @@ async def main():
     print(f"   MongoDB URL: {MONGO_URL[:50]}...")
     
     # Connect to MongoDB
-    client = AsyncIOMotorClient(MONGO_URL)
+    write_concern = {"w": 1, "journal": False} if args.dev else {}
+    client = AsyncMongoClient(MONGO_URL, maxPoolSize=POOL_SIZE, **write_concern)
     db = client[DB_NAME]
     
     try:
+        # Open connections up front so handshakes don't land on the concurrent writes
+        await asyncio.gather(*(client.admin.command("ping") for _ in range(POOL_SIZE // 2)))
+        
+        # Make sure the lookups below (and the removal script) hit indexes
+        await ensure_indexes(db, [
+            "users", "customers", "activities", "risks", "opportunities",
+            "tasks", "documents", "datalabs_reports",
+        ])
+        
         # Get or create CSM users
         print("\n1. Setting up CSM users...")
         csm_users = await get_or_create_csm_users(db)
@@ -493,26 +567,18 @@ async def main():
         
         # Create customers
         print("\n2. Creating 50 customers...")
-        customer_ids = await create_customers(db, csm_users)
-        
-        # Create related data
-        print("\n3. Creating activities...")
-        await create_activities(db, customer_ids, csm_users)
-        
-        print("\n4. Creating risks...")
-        await create_risks(db, customer_ids, csm_users)
-        
-        print("\n5. Creating opportunities...")
-        await create_opportunities(db, customer_ids, csm_users)
-        
-        print("\n6. Creating tasks...")
-        await create_tasks(db, customer_ids, csm_users)
-        
-        print("\n7. Creating documents...")
-        await create_documents(db, customer_ids, csm_users)
+        customers = await create_customers(db, csm_users)
         
-        print("\n8. Creating DataLabs reports...")
-        await create_datalabs_reports(db, customer_ids, csm_users)
+        # Create related data (independent collections, written concurrently)
+        print("\n3. Creating activities, risks, opportunities, tasks, documents and DataLabs reports...")
+        await asyncio.gather(
+            create_activities(db, customers, csm_users),
+            create_risks(db, customers, csm_users),
+            create_opportunities(db, customers, csm_users),
+            create_tasks(db, customers, csm_users),
+            create_documents(db, customers, csm_users),
+            create_datalabs_reports(db, customers, csm_users),
+        )
         
         print("\n" + "=" * 60)
         print("✅ Dummy data creation completed successfully!")
@@ -535,7 +601,7 @@ async def main():
         import traceback
         traceback.print_exc()
     finally:
-        client.close()
+        await client.close()
 
 
 if __name__ == "__main__":
@@ -10,22 +10,31 @@ stay consistent.
 
 from __future__ import annotations
 
+import asyncio
 import logging
-from typing import Any, Dict, List, Tuple, Union
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
 
+from pymongo import IndexModel
 from pymongo.errors import CollectionInvalid, OperationFailure
 
 logger = logging.getLogger(__name__)
 
 IndexKeys = Union[str, List[Tuple[str, int]]]
 
+# Serves only the dummy-data scripts (tags == "DUMMY_DATA"), so it is partial: production
+# documents without that tag are not indexed and add no write or storage cost.
+_DUMMY_DATA_TAGS_INDEX: Tuple[IndexKeys, Dict[str, Any]] = (
+    "tags",
+    {"partialFilterExpression": {"tags": "DUMMY_DATA"}, "name": "dummy_data_tags"},
+)
 
-def _dt_or_str() -> List[str]:
-    # Many writes store timestamps as ISO strings today; allow both to avoid breaking.
-    return ["date", "string"]
+# Bump whenever VALIDATORS, INDEXES or DATE_FIELDS change so ensure_schema re-applies them on next startup.
+SCHEMA_VERSION = "2026-10-16-i"
 
-def _dt_or_str_or_null() -> List[str]:
-    return ["date", "string", "null"]
+
+# Many writes store timestamps as ISO strings today; allow both to avoid breaking.
+_DT_OR_STR = ("date", "string")
+_DT_OR_STR_OR_NULL = ("date", "string", "null")
 
 
 VALIDATORS: Dict[str, Dict[str, Any]] = {
@@ -47,13 +56,13 @@ VALIDATORS: Dict[str, Dict[str, Any]] = {
                 "job_title": {"bsonType": ["string", "null"]},
                 "department": {"bsonType": ["string", "null"]},
                 "manager_id": {"bsonType": ["string", "null"]},
-                "last_login_at": {"bsonType": _dt_or_str_or_null()},
+                "last_login_at": {"bsonType": _DT_OR_STR_OR_NULL},
                 "created_by_id": {"bsonType": ["string", "null"]},
                 "created_by_name": {"bsonType": ["string", "null"]},
                 "invite_token": {"bsonType": ["string", "null"]},
-                "invite_expires_at": {"bsonType": _dt_or_str_or_null()},
+                "invite_expires_at": {"bsonType": _DT_OR_STR_OR_NULL},
                 "password": {"bsonType": "string"},
-                "created_at": {"bsonType": _dt_or_str()},
+                "created_at": {"bsonType": _DT_OR_STR},
             },
         }
     },
@@ -92,8 +101,8 @@ VALIDATORS: Dict[str, Dict[str, Any]] = {
                 "tags": {"bsonType": "array"},
                 "stakeholders": {"bsonType": "array"},
                 "last_activity_date": {"bsonType": ["string", "null"]},
-                "created_at": {"bsonType": _dt_or_str()},
-                "updated_at": {"bsonType": _dt_or_str()},
+                "created_at": {"bsonType": _DT_OR_STR},
+                "updated_at": {"bsonType": _DT_OR_STR},
             },
         }
     },
@@ -106,7 +115,7 @@ VALIDATORS: Dict[str, Dict[str, Any]] = {
                 "customer_id": {"bsonType": "string"},
                 "customer_name": {"bsonType": ["string", "null"]},
                 "activity_type": {"bsonType": "string"},
-                "activity_date": {"bsonType": _dt_or_str()},
+                "activity_date": {"bsonType": _DT_OR_STR},
                 "title": {"bsonType": "string"},
                 "summary": {"bsonType": "string"},
                 "internal_notes": {"bsonType": ["string", "null"]},
@@ -116,7 +125,7 @@ VALIDATORS: Dict[str, Dict[str, Any]] = {
                 "follow_up_status": {"bsonType": ["string", "null"]},
                 "csm_id": {"bsonType": "string"},
                 "csm_name": {"bsonType": ["string", "null"]},
-                "created_at": {"bsonType": _dt_or_str()},
+                "created_at": {"bsonType": _DT_OR_STR},
             },
         }
     },
@@ -143,8 +152,8 @@ VALIDATORS: Dict[str, Dict[str, Any]] = {
                 "resolution_date": {"bsonType": ["string", "null"]},
                 "assigned_to_id": {"bsonType": "string"},
                 "assigned_to_name": {"bsonType": ["string", "null"]},
-                "created_at": {"bsonType": _dt_or_str()},
-                "updated_at": {"bsonType": _dt_or_str()},
+                "created_at": {"bsonType": _DT_OR_STR},
+                "updated_at": {"bsonType": _DT_OR_STR},
             },
         }
     },
@@ -165,8 +174,8 @@ VALIDATORS: Dict[str, Dict[str, Any]] = {
                 "expected_close_date": {"bsonType": ["string", "null"]},
                 "owner_id": {"bsonType": "string"},
                 "owner_name": {"bsonType": ["string", "null"]},
-                "created_at": {"bsonType": _dt_or_str()},
-                "updated_at": {"bsonType": _dt_or_str()},
+                "created_at": {"bsonType": _DT_OR_STR},
+                "updated_at": {"bsonType": _DT_OR_STR},
             },
         }
     },
@@ -189,8 +198,8 @@ VALIDATORS: Dict[str, Dict[str, Any]] = {
                 "completed_date": {"bsonType": ["string", "null"]},
                 "created_by_id": {"bsonType": "string"},
                 "created_by_name": {"bsonType": ["string", "null"]},
-                "created_at": {"bsonType": _dt_or_str()},
-                "updated_at": {"bsonType": _dt_or_str()},
+                "created_at": {"bsonType": _DT_OR_STR},
+                "updated_at": {"bsonType": _DT_OR_STR},
             },
         }
     },
@@ -210,7 +219,7 @@ VALIDATORS: Dict[str, Dict[str, Any]] = {
                 "sent_to": {"bsonType": "array"},
                 "created_by_id": {"bsonType": "string"},
                 "created_by_name": {"bsonType": ["string", "null"]},
-                "created_at": {"bsonType": _dt_or_str()},
+                "created_at": {"bsonType": _DT_OR_STR},
             },
         }
     },
@@ -229,7 +238,7 @@ VALIDATORS: Dict[str, Dict[str, Any]] = {
                 "file_size": {"bsonType": ["int", "long", "null"]},
                 "created_by_id": {"bsonType": ["string", "null"]},
                 "created_by_name": {"bsonType": ["string", "null"]},
-                "created_at": {"bsonType": _dt_or_str()},
+                "created_at": {"bsonType": _DT_OR_STR},
             },
         }
     },
@@ -258,6 +267,7 @@ VALIDATORS: Dict[str, Dict[str, Any]] = {
             "properties": {
                 "id": {"bsonType": "string"},
                 "initialized_at": {"bsonType": ["string", "null"]},
+                "version": {"bsonType": ["string", "null"]},
             },
         }
     },
@@ -279,9 +289,9 @@ VALIDATORS: Dict[str, Dict[str, Any]] = {
                 "cta_text": {"bsonType": ["string", "null"]},
                 "cta_url": {"bsonType": ["string", "null"]},
                 "metadata": {"bsonType": ["object", "null"]},
-                "created_at": {"bsonType": _dt_or_str()},
-                "read_at": {"bsonType": _dt_or_str_or_null()},
-                "actioned_at": {"bsonType": _dt_or_str_or_null()},
+                "created_at": {"bsonType": _DT_OR_STR},
+                "read_at": {"bsonType": _DT_OR_STR_OR_NULL},
+                "actioned_at": {"bsonType": _DT_OR_STR_OR_NULL},
             },
         }
     },
@@ -294,35 +304,50 @@ INDEXES: Dict[str, List[Tuple[IndexKeys, Dict[str, Any]]]] = {
         ("id", {"unique": True}),
         ("role", {}),
         ("status", {}),
+        ([("role", 1), ("status", 1)], {}),
         ("department", {}),
         ("manager_id", {}),
+        # AM team lookup: CSMs reporting to a manager
+        ([("manager_id", 1), ("role", 1)], {}),
+        # Invite acceptance looks users up by token; most users have none
+        ("invite_token", {"sparse": True}),
+        _DUMMY_DATA_TAGS_INDEX,
     ],
     "customers": [
         ("id", {"unique": True}),
         ("company_name", {"unique": True}),
-        ("csm_owner_id", {}),
-        ("am_owner_id", {}),
+        # Owner scope filters; the trailing id lets the accessible-id lookups be covered queries
+        ([("csm_owner_id", 1), ("id", 1)], {}),
+        ([("am_owner_id", 1), ("id", 1)], {}),
         ("health_status", {}),
         ("account_status", {}),
         ("renewal_date", {}),
         ("region", {}),
+        ("tags", {}),
     ],
     "activities": [
         ("id", {"unique": True}),
         ("customer_id", {}),
         ("activity_date", {}),
         ([("customer_id", 1), ("activity_date", -1)], {}),
+        # "own" scope: activities logged by the CSM, newest first
+        ([("csm_id", 1), ("activity_date", -1)], {}),
+        _DUMMY_DATA_TAGS_INDEX,
     ],
     "risks": [
         ("id", {"unique": True}),
         ("customer_id", {}),
         ("status", {}),
         ("severity", {}),
+        ([("assigned_to_id", 1), ("created_at", -1)], {}),
+        _DUMMY_DATA_TAGS_INDEX,
     ],
     "opportunities": [
         ("id", {"unique": True}),
         ("customer_id", {}),
         ("stage", {}),
+        ([("owner_id", 1), ("created_at", -1)], {}),
+        _DUMMY_DATA_TAGS_INDEX,
     ],
     "tasks": [
         ("id", {"unique": True}),
@@ -330,16 +355,21 @@ INDEXES: Dict[str, List[Tuple[IndexKeys, Dict[str, Any]]]] = {
         ("assigned_to_id", {}),
         ("status", {}),
         ("due_date", {}),
+        ([("assigned_to_id", 1), ("due_date", 1)], {}),
+        _DUMMY_DATA_TAGS_INDEX,
     ],
     "datalabs_reports": [
         ("id", {"unique": True}),
         ("customer_id", {}),
         ("report_date", {}),
+        ([("created_by_id", 1), ("report_date", -1)], {}),
+        _DUMMY_DATA_TAGS_INDEX,
     ],
     "documents": [
         ("id", {"unique": True}),
         ("customer_id", {}),
         ("created_at", {}),
+        _DUMMY_DATA_TAGS_INDEX,
     ],
     "settings": [
         ("id", {"unique": True}),
@@ -355,48 +385,178 @@ INDEXES: Dict[str, List[Tuple[IndexKeys, Dict[str, Any]]]] = {
         ("module", {}),
         ([("user_id", 1), ("created_at", -1)], {}),
         ([("user_id", 1), ("status", 1)], {}),
+        # Covers only unread rows: backs the notification-bell unread count/list. The key pattern
+        # differs from the (user_id, created_at) index above, which servers before 5.0 require.
+        # (Renamed from "unread_by_user", whose keys duplicated that index.)
+        (
+            [("user_id", 1), ("status", 1), ("created_at", -1)],
+            {"partialFilterExpression": {"status": "Unread"}, "name": "unread_by_user_status"},
+        ),
     ],
 }
 
 
-async def ensure_schema(db) -> None:
+# Timestamp fields written as BSON dates; older releases stored them as ISO strings.
+DATE_FIELDS: Dict[str, Tuple[str, ...]] = {
+    "users": ("created_at", "last_login_at", "invite_expires_at"),
+}
+
+# Optional DATE_FIELDS: strings that cannot be converted are set to null rather than kept
+NULLABLE_DATE_FIELDS: Dict[str, Tuple[str, ...]] = {
+    "users": ("last_login_at", "invite_expires_at"),
+}
+
+
+async def migrate_dates(db) -> bool:
+    """
+    Convert legacy ISO-string values of DATE_FIELDS to BSON dates in place. Unparseable values
+    become null for NULLABLE_DATE_FIELDS and are kept as they are otherwise.
+    Returns False if any conversion could not run.
+    """
+    ok = True
+    updates = [
+        (name, field)
+        for name, fields in DATE_FIELDS.items()
+        for field in fields
+    ]
+    results = await asyncio.gather(
+        *(
+            db[name].update_many(
+                {field: {"$type": "string"}},
+                [{"$set": {field: {"$convert": {
+                    "input": f"${field}",
+                    "to": "date",
+                    "onError": None if field in NULLABLE_DATE_FIELDS.get(name, ()) else f"${field}",
+                }}}}],
+            )
+            for name, field in updates
+        ),
+        return_exceptions=True,
+    )
+    for (name, field), result in zip(updates, results):
+        if isinstance(result, OperationFailure):
+            # Pipeline updates need MongoDB 4.2+; left as strings and retried next startup.
+            ok = False
+            logger.warning("Could not convert %s.%s to dates: %s", name, field, result)
+        elif isinstance(result, BaseException):
+            raise result
+    return ok
+
+
+# Indexes no longer declared in INDEXES that ensure_schema drops, by collection.
+# tags_1: full tags indexes replaced by the partial dummy_data_tags index.
+RETIRED_INDEXES: Dict[str, Tuple[str, ...]] = {
+    name: ("tags_1",)
+    for name in ("users", "activities", "risks", "opportunities", "tasks", "datalabs_reports", "documents")
+}
+
+
+async def drop_retired_indexes(db) -> None:
+    """Drop RETIRED_INDEXES where they still exist (missing indexes are ignored)."""
+    targets = [(name, index) for name, indexes in RETIRED_INDEXES.items() for index in indexes]
+    results = await asyncio.gather(
+        *(db[name].drop_index(index) for name, index in targets),
+        return_exceptions=True,
+    )
+    for (name, index), result in zip(targets, results):
+        if isinstance(result, OperationFailure):
+            # IndexNotFound (27) / NamespaceNotFound (26): already gone
+            if result.code not in (26, 27):
+                logger.warning("Could not drop index %s on %s: %s", index, name, result)
+        elif isinstance(result, BaseException):
+            raise result
+
+
+async def ensure_schema(db, force: bool = False) -> None:
     """
     Idempotently ensure collections exist, optional validators are applied, and indexes are present.
-    Safe to run on every startup.
+    Safe to run on every startup. Each phase issues its commands concurrently.
+    Returns early when _meta already records SCHEMA_VERSION, unless `force` is set.
     """
+    if not force:
+        meta = await db["_meta"].find_one({"id": "schema_version"}, {"_id": 0, "version": 1})
+        if meta and meta.get("version") == SCHEMA_VERSION:
+            return
+
     existing = set(await db.list_collection_names())
 
     # Create collections (so validators can be attached at create-time).
-    for name, validator in VALIDATORS.items():
-        if name not in existing:
-            try:
-                await db.create_collection(
-                    name,
-                    validator=validator,
-                    validationLevel="moderate",
-                )
-                logger.info("Created collection %s with validator", name)
-            except CollectionInvalid:
-                # Someone created it concurrently.
-                pass
-            except OperationFailure as e:
-                # Some Atlas tiers/roles may not permit validators; continue with indexes.
-                logger.warning("Could not create collection %s with validator (%s)", name, e)
-
-    # Try to apply/update validators for existing collections.
-    for name, validator in VALIDATORS.items():
-        try:
-            await db.command({"collMod": name, "validator": validator, "validationLevel": "moderate"})
-        except OperationFailure:
-            # Ignore if not authorized / not supported. Indexes still enforce uniqueness etc.
-            pass
-
-    # Ensure indexes
-    for name, idx_list in INDEXES.items():
-        coll = db[name]
-        for keys, kwargs in idx_list:
-            try:
-                await coll.create_index(keys, **kwargs)
-            except OperationFailure as e:
-                logger.warning("Could not create index on %s (%s, %s): %s", name, keys, kwargs, e)
+    missing = [name for name in VALIDATORS if name not in existing]
+    results = await asyncio.gather(
+        *(
+            db.create_collection(name, validator=VALIDATORS[name], validationLevel="moderate")
+            for name in missing
+        ),
+        return_exceptions=True,
+    )
+    just_created = set()
+    for name, result in zip(missing, results):
+        if isinstance(result, CollectionInvalid):
+            # Someone created it concurrently.
+            continue
+        if isinstance(result, OperationFailure):
+            # Some Atlas tiers/roles may not permit validators; continue with indexes.
+            logger.warning("Could not create collection %s with validator (%s)", name, result)
+        elif isinstance(result, BaseException):
+            raise result
+        else:
+            just_created.add(name)
+            logger.info("Created collection %s with validator", name)
+
+    # Try to apply/update validators for pre-existing collections
+    # (ones created above already carry the current validator).
+    results = await asyncio.gather(
+        *(
+            db.command({"collMod": name, "validator": validator, "validationLevel": "moderate"})
+            for name, validator in VALIDATORS.items()
+            if name not in just_created
+        ),
+        return_exceptions=True,
+    )
+    for result in results:
+        # Ignore OperationFailure (not authorized / not supported). Indexes still enforce uniqueness etc.
+        if isinstance(result, BaseException) and not isinstance(result, OperationFailure):
+            raise result
 
+    dates_ok = await migrate_dates(db)
+    # Before creating indexes: servers before 5.0 reject a partial index whose keys match a full one
+    await drop_retired_indexes(db)
+
+    # Only stamp the version once every index and date conversion is in place,
+    # so failures are retried next startup.
+    if await ensure_indexes(db) and dates_ok:
+        await db["_meta"].update_one(
+            {"id": "schema_version"},
+            {"$set": {"id": "schema_version", "version": SCHEMA_VERSION}},
+            upsert=True,
+        )
+
+
+async def ensure_indexes(db, names: Optional[Iterable[str]] = None) -> bool:
+    """
+    Idempotently create the indexes declared in INDEXES, one createIndexes command per collection.
+    Pass `names` to limit this to a subset of collections (e.g. from one-off scripts).
+    Returns False if any index could not be created.
+    """
+    ok = True
+    names = list(INDEXES if names is None else names)
+    results = await asyncio.gather(
+        *(
+            db[name].create_indexes([IndexModel(keys, **kwargs) for keys, kwargs in INDEXES[name]])
+            for name in names
+        ),
+        return_exceptions=True,
+    )
+    for name, result in zip(names, results):
+        if isinstance(result, OperationFailure):
+            # createIndexes is rejected as a whole; fall back to one-by-one so the
+            # remaining indexes on this collection still get built.
+            for keys, kwargs in INDEXES[name]:
+                try:
+                    await db[name].create_index(keys, **kwargs)
+                except OperationFailure as e:
+                    ok = False
+                    logger.warning("Could not create index on %s (%s, %s): %s", name, keys, kwargs, e)
+        elif isinstance(result, BaseException):
+            raise result
+    return ok
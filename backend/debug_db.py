@@ -2,10 +2,11 @@
 from dotenv import load_dotenv
 import os
 from pathlib import Path
-from motor.motor_asyncio import AsyncIOMotorClient
 import asyncio
 import certifi
 
+from _mongo import get_client
+
 async def test_connection():
     ROOT_DIR = Path(__file__).parent
     env_path = ROOT_DIR / '.env'
@@ -22,21 +23,16 @@ async def test_connection():
         print("MONGO_URL is missing!")
         return
 
+    print("Attempting to connect...")
+    client = get_client(mongo_url, tlsCAFile=certifi.where())
     try:
-        print("Attempting to connect...")
-        client = AsyncIOMotorClient(
-            mongo_url,
-            tlsCAFile=certifi.where(),
-            tls=True,
-            tlsAllowInvalidCertificates=True,
-            uuidRepresentation='standard',
-            serverSelectionTimeoutMS=5000 
-        )
         # Force a connection attempt
         await client.server_info()
         print("Successfully connected to MongoDB!")
     except Exception as e:
         print(f"Connection failed: {e}")
+    finally:
+        await client.close()
 
 if __name__ == "__main__":
     asyncio.run(test_connection())
@@ -14,9 +14,9 @@ import os
 from datetime import datetime, timezone
 from pathlib import Path
 
-from motor.motor_asyncio import AsyncIOMotorClient
 from dotenv import load_dotenv
 
+from _mongo import get_client
 from db_schema import ensure_schema
 
 
@@ -28,10 +28,10 @@ async def main():
     mongo_url = os.environ["MONGO_URL"]
     db_name = os.environ["DB_NAME"]
 
-    client = AsyncIOMotorClient(mongo_url)
+    client = get_client(mongo_url)
     db = client[db_name]
 
-    await ensure_schema(db)
+    await ensure_schema(db, force=True)
 
     # Ping by writing a small marker doc (optional)
     await db["_meta"].update_one(
@@ -41,7 +41,7 @@ async def main():
     )
 
     print(f"✅ Initialized MongoDB database '{db_name}' with indexes.")
-    client.close()
+    await client.close()
 
 
 if __name__ == "__main__":
@@ -1,14 +1,14 @@
 import asyncio
 import os
-from motor.motor_asyncio import AsyncIOMotorClient
 from dotenv import load_dotenv
 import certifi
 import sys
 
-# Load env vars
-load_dotenv('backend/.env')
+from _mongo import get_client
 
 async def migrate_products():
+    # Load env vars
+    load_dotenv('backend/.env')
     mongo_url = os.environ.get('MONGO_URL')
     db_name = os.environ.get('DB_NAME')
 
@@ -18,37 +18,31 @@ async def migrate_products():
 
     print("Connecting to MongoDB...")
     try:
-        client = AsyncIOMotorClient(
-            mongo_url,
-            tlsCAFile=certifi.where(),
-            tls=True,
-            tlsAllowInvalidCertificates=True,
-            uuidRepresentation='standard'
-        )
+        client = get_client(mongo_url, tlsCAFile=certifi.where())
         db = client[db_name]
         print(f"Connected to database: {db_name}")
         
-        # 1. Update customers to have products_purchased array
-        print("Migrating customers: ensuring 'products_purchased' field exists...")
+        # Backfill 'products_purchased' and 'primary_objective' in one pass
+        # (pipeline update: each field keeps its value when already set)
+        print("Migrating customers: ensuring 'products_purchased' and 'primary_objective' fields exist...")
         result = await db.customers.update_many(
-            {"products_purchased": {"$exists": False}},
-            {"$set": {"products_purchased": []}}
+            {"$or": [
+                {"products_purchased": {"$exists": False}},
+                {"primary_objective": {"$exists": False}}
+            ]},
+            [{"$set": {
+                "products_purchased": {"$ifNull": ["$products_purchased", []]},
+                "primary_objective": {"$ifNull": ["$primary_objective", ""]}
+            }}],
+            bypass_document_validation=True
         )
         print(f"Matched {result.matched_count} customers, modified {result.modified_count}.")
 
-        # 2. Update customers to have primary_objective field
-        print("Migrating customers: ensuring 'primary_objective' field exists...")
-        result_obj = await db.customers.update_many(
-            {"primary_objective": {"$exists": False}},
-            {"$set": {"primary_objective": ""}}
-        )
-        print(f"Matched {result_obj.matched_count} customers, modified {result_obj.modified_count}.")
-
     except Exception as e:
         print(f"Migration failed: {e}")
     finally:
         if 'client' in locals():
-            client.close()
+            await client.close()
 
 if __name__ == "__main__":
     if sys.platform == 'win32':
@@ -2,23 +2,33 @@ from fastapi import FastAPI, APIRouter, HTTPException, Depends, status, File, Up
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
-from starlette.responses import StreamingResponse, JSONResponse
+from fastapi.responses import ORJSONResponse
+from starlette.responses import StreamingResponse
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import ReturnDocument
+from pymongo.errors import BulkWriteError, DuplicateKeyError
 import os
+import copy
+import asyncio
 import logging
 import csv
 import io
 import traceback
-import json
+import orjson
 from pathlib import Path
 from pydantic import BaseModel, Field, ConfigDict, EmailStr
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple, Callable, Awaitable
 import uuid
+import time
+from concurrent.futures import ThreadPoolExecutor
+import types
+import hashlib
 from datetime import datetime, timezone, timedelta
 import jwt
 import bcrypt
 from enum import Enum
 import secrets
+import re
 
 import sys
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
@@ -34,8 +44,8 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Create the main app
-app = FastAPI()
+# Create the main app (orjson: faster encoding of the large settings/permissions/export payloads)
+app = FastAPI(default_response_class=ORJSONResponse)
 
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
@@ -43,14 +53,13 @@ async def global_exception_handler(request: Request, exc: Exception):
     # unexpected errors often mean DB issues or code bugs
     logger.error(f"Global error on {request.url.path}: {error_msg}")
     traceback.print_exc()
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=500,
         content={"detail": error_msg, "path": str(request.url.path)}
     )
 api_router = APIRouter(prefix="/api")
 security = HTTPBearer()
 
-# MongoDB connection
 # MongoDB connection
 import certifi
 mongo_url = os.environ.get('MONGO_URL')
@@ -61,13 +70,23 @@ db = None
 
 if mongo_url and db_name:
     try:
-        # Use certifi AND allow invalid certs to bypass Vercel environment issues
+        # Validate against certifi's CA bundle. ALLOW_INVALID_TLS=1 restores the old permissive mode
+        # for environments with broken CA stores (previously always on for Vercel).
+        tls_kwargs: Dict[str, Any] = {"tlsCAFile": certifi.where(), "tls": True}
+        if os.environ.get("ALLOW_INVALID_TLS") == "1":
+            tls_kwargs["tlsAllowInvalidCertificates"] = True
+        # One client per process, created at import and closed on shutdown
         client = AsyncIOMotorClient(
             mongo_url,
-            tlsCAFile=certifi.where(),
-            tls=True,
-            tlsAllowInvalidCertificates=True,
-            uuidRepresentation='standard'
+            **tls_kwargs,
+            uuidRepresentation='standard',
+            # User timestamps are BSON dates; read them back as UTC-aware datetimes
+            tz_aware=True,
+            # Sized for concurrent asyncio.gather fan-out; minPoolSize keeps warm connections
+            maxPoolSize=int(os.environ.get("MONGO_MAX_POOL", "50")),
+            minPoolSize=int(os.environ.get("MONGO_MIN_POOL", "10")),
+            maxConnecting=4,
+            serverSelectionTimeoutMS=3000,
         )
         db = client[db_name]
     except Exception as e:
@@ -92,19 +111,46 @@ JWT_SECRET = os.environ.get('JWT_SECRET', 'your-secret-key-change-in-production'
 JWT_ALGORITHM = "HS256"
 JWT_EXPIRATION_HOURS = 168  # 7 days
 
+# Decoded-token cache: skips HMAC verification + JSON parsing for tokens seen recently.
+# Entries live at most JWT_CACHE_TTL seconds and never past the token's own `exp`.
+JWT_CACHE_ENABLED = os.environ.get("JWT_CACHE_ENABLED", "1") == "1"
+JWT_CACHE_TTL = 60
+JWT_CACHE_MAX_ENTRIES = 10000
+_JWT_CACHE: Dict[bytes, tuple] = {}  # blake2b(token) -> (expires_at, payload)
+
 
 
 
-SETTINGS_CACHE = None
-SETTINGS_CACHE_TIMESTAMP = 0
 CACHE_TTL = 300  # 5 minutes
 
+class _SettingsCache:
+    """
+    Process-wide cache of the global settings doc.
+    `future` is the in-flight load shared by concurrent misses (single-flight), and
+    `expires_at` is on the time.monotonic() clock.
+    """
+    value: Optional[Dict[str, Any]] = None
+    version: int = 0  # bumped whenever the stored doc changes
+    expires_at: float = 0.0
+    future: Optional[asyncio.Future] = None
+    refresher: Optional[asyncio.Task] = None
+    warmup: Optional[asyncio.Task] = None  # startup load; referenced so it isn't garbage-collected
+
+    @classmethod
+    def store(cls, value: Dict[str, Any]) -> Dict[str, Any]:
+        if value != cls.value:
+            cls.version += 1
+            _EFFECTIVE_PERMS_CACHE.clear()
+        cls.value = value
+        cls.expires_at = time.monotonic() + CACHE_TTL
+        return value
+
 @app.get("/api/admin/init-db")
 async def init_db_endpoint():
     """Manually trigger schema validation and settings initialization."""
     try:
         if db:
-            await ensure_schema(db)
+            await ensure_schema(db, force=True)
             await _ensure_settings(force_refresh=True)
             return {"status": "ok", "message": "Schema and settings initialized"}
         return {"status": "error", "message": "Database not connected"}
@@ -113,12 +159,31 @@ async def init_db_endpoint():
         raise HTTPException(status_code=500, detail=str(e))
 
 async def _ensure_settings(force_refresh: bool = False) -> Dict[str, Any]:
-    global SETTINGS_CACHE, SETTINGS_CACHE_TIMESTAMP
-    
-    now = datetime.now().timestamp()
-    if not force_refresh and SETTINGS_CACHE and (now - SETTINGS_CACHE_TIMESTAMP < CACHE_TTL):
-        return SETTINGS_CACHE
+    if not force_refresh and _SettingsCache.value and time.monotonic() < _SettingsCache.expires_at:
+        return _SettingsCache.value
+
+    # Concurrent misses await the same load instead of each querying Mongo
+    fut = _SettingsCache.future
+    if fut is None:
+        fut = _SettingsCache.future = asyncio.ensure_future(_fetch_settings())
+        fut.add_done_callback(_clear_settings_future)
+    # shield: a cancelled request must not cancel the load other callers are waiting on
+    return await asyncio.shield(fut)
+
+def _clear_settings_future(fut: asyncio.Future) -> None:
+    if _SettingsCache.future is fut:
+        _SettingsCache.future = None
+
+async def _settings_refresher() -> None:
+    """Reload settings every CACHE_TTL/2 so requests normally never wait on Mongo for them."""
+    while True:
+        await asyncio.sleep(CACHE_TTL / 2)
+        try:
+            await _ensure_settings(force_refresh=True)
+        except Exception as e:
+            logger.warning(f"Background settings refresh failed: {e}")
 
+async def _fetch_settings() -> Dict[str, Any]:
     existing = await db.settings.find_one({"id": "global"}, {"_id": 0})
     if existing:
         # Backfill new fields (idempotent migrations)
@@ -145,12 +210,14 @@ async def _ensure_settings(force_refresh: bool = False) -> Dict[str, Any]:
             pass
 
         if missing_updates:
-            await db.settings.update_one({"id": "global"}, {"$set": missing_updates})
-            existing = await db.settings.find_one({"id": "global"}, {"_id": 0}) or existing
+            existing = await db.settings.find_one_and_update(
+                {"id": "global"},
+                {"$set": missing_updates},
+                projection={"_id": 0},
+                return_document=ReturnDocument.AFTER,
+            ) or existing
         
-        SETTINGS_CACHE = existing
-        SETTINGS_CACHE_TIMESTAMP = now
-        return existing
+        return _SettingsCache.store(existing)
 
     # Default settings creation (trimmed for brevity, logic remains same but now cached)
     defaults = SettingsDoc(
@@ -220,9 +287,7 @@ async def _ensure_settings(force_refresh: bool = False) -> Dict[str, Any]:
     ).model_dump()
 
     await db.settings.insert_one(defaults)
-    SETTINGS_CACHE = defaults
-    SETTINGS_CACHE_TIMESTAMP = now
-    return defaults
+    return _SettingsCache.store(defaults)
 
 # Enums
 class UserRole(str, Enum):
@@ -248,6 +313,9 @@ class PlanType(str, Enum):
     PREMIUM = "Premium"
     CUSTOM = "Custom"
 
+# Plain-string value sets for validating raw (e.g. CSV) input without constructing Enum members
+_PLAN_TYPE_VALUES = frozenset(p.value for p in PlanType)
+
 class ProductType(str, Enum):
     POST_CALL = "Post Call"
     RTA = "RTA"
@@ -481,7 +549,7 @@ class SettingsUpdate(BaseModel):
     templates: Optional[List[TemplateGroup]] = None
     role_permissions: Optional[Dict[str, Any]] = None
 
-def _default_role_permissions() -> Dict[str, Any]:
+def _build_default_role_permissions() -> Dict[str, Any]:
     # Single source of truth for the default permission map.
     return {
         # Modules present in this app today:
@@ -593,61 +661,86 @@ def _default_role_permissions() -> Dict[str, Any]:
         },
     }
 
+# Built once at import; treat as read-only and copy via _default_role_permissions() before storing
+_DEFAULT_ROLE_PERMISSIONS: Dict[str, Any] = _build_default_role_permissions()
+
+def _default_role_permissions() -> Dict[str, Any]:
+    return copy.deepcopy(_DEFAULT_ROLE_PERMISSIONS)
+
 
 
 # --- Permissions evaluation (configurable via SettingsDoc.role_permissions) ---
+# none < own < team < all
+_SCOPE_RANK: Dict[Optional[str], int] = {"none": 0, None: 0, "own": 1, "team": 2, "all": 3}
+# Keys _merge_module_perms combines; any other key is a policy field copied from the later role
+_MERGED_PERM_KEYS = frozenset({"enabled", "scope", "actions"})
+
 def _scope_rank(scope: Optional[str]) -> int:
-    # none < own < team < all
-    m = {"none": 0, None: 0, "own": 1, "team": 2, "all": 3}
-    return m.get(scope, 0)
+    return _SCOPE_RANK.get(scope, 0)
 
 def _merge_module_perms(a: Dict[str, Any], b: Dict[str, Any]) -> Dict[str, Any]:
     """
     OR booleans, choose widest scope.
     """
-    out: Dict[str, Any] = {**(a or {})}
-    if "enabled" in (b or {}):
-        out["enabled"] = bool(out.get("enabled")) or bool(b.get("enabled"))
+    b = b or {}
+    out: Dict[str, Any] = dict(a) if a else {}
+    if "enabled" in b:
+        out["enabled"] = bool(out.get("enabled")) or bool(b["enabled"])
 
-    sa = out.get("scope")
-    sb = (b or {}).get("scope")
+    sa, sb = out.get("scope"), b.get("scope")
     out["scope"] = sa if _scope_rank(sa) >= _scope_rank(sb) else sb
 
-    actions = {**(out.get("actions") or {})}
-    for k, v in ((b or {}).get("actions") or {}).items():
-        actions[k] = bool(actions.get(k)) or bool(v)
-    if actions:
+    b_actions = b.get("actions")
+    if b_actions:
+        actions = dict(out.get("actions") or {})
+        for k, v in b_actions.items():
+            actions[k] = bool(actions.get(k)) or bool(v)
         out["actions"] = actions
 
     # keep extra policy fields (field_policy, etc.)
-    for k, v in (b or {}).items():
-        if k not in {"enabled", "scope", "actions"}:
-            out[k] = v
+    out |= {k: v for k, v in b.items() if k not in _MERGED_PERM_KEYS}
     return out
 
+# (settings version, roles) -> (effective permissions, granted (module, action) pairs);
+# cleared by _SettingsCache.store on change
+_EFFECTIVE_PERMS_CACHE: Dict[tuple, tuple] = {}
+
 async def _get_effective_permissions(current_user: Dict) -> Dict[str, Any]:
     """
     Returns: { modules: { moduleKey: {enabled, scope?, actions? ...} } }
+    The result is shared between requests: treat it as read-only.
     """
+    return (await _effective_permissions_entry(current_user))[0]
+
+async def _effective_permissions_entry(current_user: Dict) -> tuple:
     settings = await _ensure_settings()
-    role_perms: Dict[str, Any] = (settings or {}).get("role_permissions") or {}
     roles = _roles(current_user) or ["READ_ONLY"]
+    # Role order is kept in the key: extra policy fields (field_policy) are last-role-wins
+    key = (_SettingsCache.version, tuple(roles))
+    cached = _EFFECTIVE_PERMS_CACHE.get(key)
+    if cached is not None:
+        return cached
 
+    role_perms: Dict[str, Any] = (settings or {}).get("role_permissions") or {}
     effective: Dict[str, Any] = {"modules": {}}
     for r in roles:
         rp = role_perms.get(r) or {}
         for mod, mp in (rp.get("modules") or {}).items():
             cur = effective["modules"].get(mod) or {}
             effective["modules"][mod] = _merge_module_perms(cur, mp or {})
-    return effective
+    frozen = types.MappingProxyType(effective)
 
-def _has_perm(effective: Dict[str, Any], module_key: str, action: Optional[str] = None) -> bool:
-    mod = (effective.get("modules") or {}).get(module_key) or {}
-    if not mod.get("enabled"):
-        return False
-    if not action:
-        return True
-    return bool((mod.get("actions") or {}).get(action))
+    # Flat grant set, so a permission check is one lookup: (module, None) when the module is
+    # enabled, plus (module, action) for each granted action of an enabled module
+    grants = set()
+    for mod, mp in effective["modules"].items():
+        if mp.get("enabled"):
+            grants.add((mod, None))
+            grants.update((mod, a) for a, ok in (mp.get("actions") or {}).items() if ok)
+
+    entry = (frozen, frozenset(grants))
+    _EFFECTIVE_PERMS_CACHE[key] = entry
+    return entry
 
 async def _check_db_connection():
     """Check if database connection is available."""
@@ -658,8 +751,8 @@ async def _check_db_connection():
         )
 
 async def _require_perm(current_user: Dict, module_key: str, action: Optional[str] = None) -> Dict[str, Any]:
-    eff = await _get_effective_permissions(current_user)
-    if not _has_perm(eff, module_key, action):
+    eff, grants = await _effective_permissions_entry(current_user)
+    if (module_key, action or None) not in grants:
         raise HTTPException(status_code=403, detail="Forbidden")
     return eff
 
@@ -889,11 +982,56 @@ class DataLabsReportCreate(BaseModel):
     sent_to: List[str] = []
 
 # Helper Functions
-def hash_password(password: str) -> str:
-    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+# bcrypt cost factor (the library default is 12); verification works for any cost
+BCRYPT_ROUNDS = int(os.environ.get("BCRYPT_ROUNDS", "12"))
+
+# bcrypt runs off the event loop on its own pool. bcrypt releases the GIL while hashing, so
+# threads use every core; a dedicated pool keeps login bursts from queueing behind (or
+# starving) other asyncio.to_thread work on the default executor.
+_BCRYPT_EXECUTOR = ThreadPoolExecutor(max_workers=os.cpu_count() or 1, thread_name_prefix="bcrypt")
+
+async def _run_bcrypt(fn, *args):
+    return await asyncio.get_running_loop().run_in_executor(_BCRYPT_EXECUTOR, fn, *args)
+
+async def hash_password(password: str) -> str:
+    hashed = await _run_bcrypt(bcrypt.hashpw, password.encode('utf-8'), bcrypt.gensalt(rounds=BCRYPT_ROUNDS))
+    return hashed.decode('utf-8')
+
+# Recent (password, stored hash) verification outcomes, so client retries of the same login
+# skip a second bcrypt run. Keyed by a digest; neither the password nor the hash is kept.
+BCRYPT_CACHE_TTL = 30
+BCRYPT_CACHE_MAX_ENTRIES = 2048
+_BCRYPT_CACHE: Dict[bytes, tuple] = {}  # keyed blake2b(password, hash) -> (expires_at, ok)
+# Per-process MAC key, so cached keys are not a fast, brute-forceable digest of the plaintext password
+_BCRYPT_CACHE_KEY = secrets.token_bytes(32)
+
+def _bcrypt_cost(hashed: str) -> Optional[int]:
+    # "$2b$12$<salt+hash>" -> 12
+    try:
+        return int(hashed.split("$")[2])
+    except (IndexError, ValueError):
+        return None
 
-def verify_password(password: str, hashed: str) -> bool:
-    return bcrypt.checkpw(password.encode('utf-8'), hashed.encode('utf-8'))
+# Password field of invited users until they accept; never a bcrypt hash, so no password matches it
+UNUSABLE_PASSWORD_PREFIX = "!"
+
+def _unusable_password() -> str:
+    return UNUSABLE_PASSWORD_PREFIX + secrets.token_urlsafe(18)
+
+async def verify_password(password: str, hashed: str) -> bool:
+    if hashed.startswith(UNUSABLE_PASSWORD_PREFIX):
+        return False
+    key = hashlib.blake2b(password.encode('utf-8') + b"\0" + hashed.encode('utf-8'), digest_size=16, key=_BCRYPT_CACHE_KEY).digest()
+    now = time.monotonic()
+    hit = _BCRYPT_CACHE.get(key)
+    if hit and hit[0] > now:
+        return hit[1]
+
+    ok = await _run_bcrypt(bcrypt.checkpw, password.encode('utf-8'), hashed.encode('utf-8'))
+    if len(_BCRYPT_CACHE) >= BCRYPT_CACHE_MAX_ENTRIES:
+        _BCRYPT_CACHE.clear()
+    _BCRYPT_CACHE[key] = (now + BCRYPT_CACHE_TTL, ok)
+    return ok
 
 def create_access_token(user_id: str, email: str, roles: List[str]) -> str:
     roles = [(r.value if isinstance(r, Enum) else str(r)) for r in (roles or [])]
@@ -908,10 +1046,41 @@ def create_access_token(user_id: str, email: str, roles: List[str]) -> str:
     }
     return jwt.encode(payload, JWT_SECRET, algorithm=JWT_ALGORITHM)
 
+def _with_roles(payload: Dict) -> Dict:
+    # Normalize roles once per decode instead of on every permission check
+    payload["_roles"] = _normalize_roles(payload)
+    payload["_role_set"] = frozenset(payload["_roles"])
+    return payload
+
+def _decode_jwt_cached(token: str) -> Dict:
+    """jwt.decode with a short-lived in-process cache; invalid tokens raise and are never cached."""
+    if not JWT_CACHE_ENABLED:
+        return _with_roles(jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM]))
+
+    key = hashlib.blake2b(token.encode('utf-8'), digest_size=16).digest()
+    # Entry deadlines are on the monotonic clock; the wall clock is only read on a miss
+    now = time.monotonic()
+    hit = _JWT_CACHE.get(key)
+    if hit and hit[0] > now:
+        return dict(hit[1])
+
+    payload = _with_roles(jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM]))
+    ttl = min(float(payload.get("exp") or 0) - time.time(), JWT_CACHE_TTL)
+    if ttl > 0:
+        expires_at = now + ttl
+        if len(_JWT_CACHE) >= JWT_CACHE_MAX_ENTRIES:
+            # Drop expired entries first; if still full, start over rather than grow unbounded
+            for k in [k for k, (exp, _) in _JWT_CACHE.items() if exp <= now]:
+                del _JWT_CACHE[k]
+            if len(_JWT_CACHE) >= JWT_CACHE_MAX_ENTRIES:
+                _JWT_CACHE.clear()
+        _JWT_CACHE[key] = (expires_at, payload)
+    return dict(payload)
+
 async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)) -> Dict:
     try:
         token = credentials.credentials
-        payload = jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM])
+        payload = _decode_jwt_cached(token)
         return payload
     except jwt.ExpiredSignatureError:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token expired")
@@ -919,28 +1088,121 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
 
 # --- RBAC helpers (backend enforcement + data scoping) ---
-ROLE_ADMINISH: set[str] = {"ADMIN", "CS_OPS", "CS_LEADER"}
-ROLE_SETTINGS_ADMIN: set[str] = {"ADMIN", "CS_OPS"}
-ROLE_EXPORTS: set[str] = {"ADMIN", "CS_OPS", "CS_LEADER"}
-ROLE_OPPORTUNITIES: set[str] = {"AM", "ADMIN", "CS_OPS", "CS_LEADER", "SALES"}
+ROLE_ADMINISH: frozenset[str] = frozenset({"ADMIN", "CS_OPS", "CS_LEADER"})
+ROLE_SETTINGS_ADMIN: frozenset[str] = frozenset({"ADMIN", "CS_OPS"})
+ROLE_EXPORTS: frozenset[str] = frozenset({"ADMIN", "CS_OPS", "CS_LEADER"})
+ROLE_OPPORTUNITIES: frozenset[str] = frozenset({"AM", "ADMIN", "CS_OPS", "CS_LEADER", "SALES"})
+ROLE_USER_DIRECTORY: frozenset[str] = frozenset({"ADMIN", "CS_OPS", "CS_LEADER", "AM"})
+
+# Role/status members and their plain-string values (equal and same hash for str enums) -> value
+_ENUM_VALUES: Dict[Any, str] = {m: m.value for enum in (UserRole, UserStatus) for m in enum}
 
 def _enum_value(x: Any) -> str:
+    v = _ENUM_VALUES.get(x)
+    if v is not None:
+        return v
     return x.value if isinstance(x, Enum) else str(x)
 
-def _roles(current_user: Dict) -> List[str]:
+def _normalize_roles(current_user: Dict) -> Tuple[str, ...]:
     rs = current_user.get("roles")
     if isinstance(rs, list) and rs:
-        return [_enum_value(x) for x in rs if x]
+        return tuple(_enum_value(x) for x in rs if x)
     r = current_user.get("role")
-    return [_enum_value(r)] if r else []
+    return (_enum_value(r),) if r else ()
+
+def _roles(current_user: Dict) -> Tuple[str, ...]:
+    # Token payloads carry the normalized roles from decode time (see _decode_jwt_cached)
+    rs = current_user.get("_roles")
+    return rs if rs is not None else _normalize_roles(current_user)
+
+def _role_set(current_user: Dict) -> frozenset:
+    rs = current_user.get("_role_set")
+    return rs if rs is not None else frozenset(_roles(current_user))
 
 def _user_id(current_user: Dict) -> str:
     return str(current_user.get("user_id") or "")
 
-def _require_roles(current_user: Dict, allowed: set[str]) -> None:
-    if not set(_roles(current_user)).intersection(allowed):
+def _require_roles(current_user: Dict, allowed: frozenset[str]) -> None:
+    if allowed.isdisjoint(_role_set(current_user)):
         raise HTTPException(status_code=403, detail="Forbidden")
 
+# AM user id -> (expires_at, ids of CSMs reporting to them); cleared on any user write
+TEAM_CACHE_TTL = 60
+TEAM_CACHE_MAX_ENTRIES = 1024
+_TEAM_CSM_CACHE: Dict[str, tuple] = {}
+
+def _invalidate_team_cache() -> None:
+    _TEAM_CSM_CACHE.clear()
+
+async def _get_team_csm_ids(manager_id: str) -> List[str]:
+    """Ids of CSM users whose manager_id is `manager_id` (cached for TEAM_CACHE_TTL seconds)."""
+    now = time.monotonic()
+    hit = _TEAM_CSM_CACHE.get(manager_id)
+    if hit and hit[0] > now:
+        return list(hit[1])
+
+    managed_csms = await db.users.find(
+        {
+            "manager_id": manager_id,
+            "$or": [{"role": "CSM"}, {"roles": {"$in": ["CSM"]}}],
+        },
+        {"_id": 0, "id": 1},
+    ).to_list(5000)
+    ids = [u.get("id") for u in managed_csms if u.get("id")]
+    if len(_TEAM_CSM_CACHE) >= TEAM_CACHE_MAX_ENTRIES:
+        _TEAM_CSM_CACHE.clear()
+    _TEAM_CSM_CACHE[manager_id] = (now + TEAM_CACHE_TTL, ids)
+    return list(ids)
+
+async def _get_customer_ids_for_csms(csm_ids: List[str]) -> List[str]:
+    ids = await db.customers.distinct("id", {"csm_owner_id": {"$in": csm_ids}})
+    return [cid for cid in ids if cid]
+
+def _resolve_customer_scope(roles: frozenset, configured_scope: Optional[str]) -> str:
+    """Scope kind ("all", "own", "team" or "none") for a role combination and configured customers scope."""
+    # Sales can see all customers (but field-level restrictions apply in handlers)
+    if "SALES" in roles:
+        return "all" if configured_scope in (None, "all") else "none"
+
+    # Read-only falls back to same scope rules as CSM/AM if they also have those roles.
+    if configured_scope == "own" or ("CSM" in roles and "AM" not in roles):
+        return "own"
+
+    if configured_scope == "team" or ("AM" in roles):
+        return "team"
+
+    if configured_scope == "all":
+        return "all"
+
+    # Default: no access (empty scope => nothing)
+    return "none"
+
+async def _team_customer_scope(uid: str) -> Dict[str, Any]:
+    # AM can see:
+    # - customers they own as AM
+    # - customers owned by CSMs who report to them (manager_id == AM user id)
+    managed_csm_ids = await _get_team_csm_ids(uid)
+    return {"$or": [{"am_owner_id": uid}, {"csm_owner_id": {"$in": managed_csm_ids}}]}
+
+async def _all_customer_scope(uid: str) -> Dict[str, Any]:
+    return {}
+
+async def _own_customer_scope(uid: str) -> Dict[str, Any]:
+    return {"csm_owner_id": uid}
+
+async def _no_customer_scope(uid: str) -> Dict[str, Any]:
+    return {"id": "__none__"}
+
+_CUSTOMER_SCOPE_BUILDERS: Dict[str, Callable[[str], Awaitable[Dict[str, Any]]]] = {
+    "all": _all_customer_scope,
+    "own": _own_customer_scope,
+    "team": _team_customer_scope,
+    "none": _no_customer_scope,
+}
+
+# (roles, configured scope) -> scope kind; the role and scope vocabularies are small, so this stays tiny
+_CUSTOMER_SCOPE_KINDS: Dict[Tuple[frozenset, Optional[str]], str] = {}
+
 async def _customer_scope_query(current_user: Dict) -> Dict[str, Any]:
     """
     Data scoping:
@@ -948,10 +1210,10 @@ async def _customer_scope_query(current_user: Dict) -> Dict[str, Any]:
     - CSM => customers where csm_owner_id == current_user
     - AM => customers where am_owner_id == current_user
     """
-    roles = set(_roles(current_user))
+    roles = _role_set(current_user)
     uid = _user_id(current_user)
     # Leadership/admin/ops => all
-    if roles.intersection(ROLE_ADMINISH):
+    if not roles.isdisjoint(ROLE_ADMINISH):
         return {}
 
     # Use configured scope (if present)
@@ -962,33 +1224,11 @@ async def _customer_scope_query(current_user: Dict) -> Dict[str, Any]:
     except Exception:
         configured_scope = None
 
-    # Sales can see all customers (but field-level restrictions apply in handlers)
-    if "SALES" in roles:
-        return {} if configured_scope in (None, "all") else {"id": "__none__"}
-
-    # Read-only falls back to same scope rules as CSM/AM if they also have those roles.
-    if configured_scope == "own" or ("CSM" in roles and "AM" not in roles):
-        return {"csm_owner_id": uid}
-
-    if configured_scope == "team" or ("AM" in roles):
-        # AM can see:
-        # - customers they own as AM
-        # - customers owned by CSMs who report to them (manager_id == AM user id)
-        managed_csms = await db.users.find(
-            {
-                "manager_id": uid,
-                "$or": [{"role": "CSM"}, {"roles": {"$in": ["CSM"]}}],
-            },
-            {"_id": 0, "id": 1},
-        ).to_list(5000)
-        managed_csm_ids = [u.get("id") for u in managed_csms if u.get("id")]
-        return {"$or": [{"am_owner_id": uid}, {"csm_owner_id": {"$in": managed_csm_ids}}]}
-
-    if configured_scope == "all":
-        return {}
-
-    # Default: no access (empty scope => nothing)
-    return {"id": "__none__"}
+    key = (roles, configured_scope)
+    kind = _CUSTOMER_SCOPE_KINDS.get(key)
+    if kind is None:
+        kind = _CUSTOMER_SCOPE_KINDS[key] = _resolve_customer_scope(roles, configured_scope)
+    return await _CUSTOMER_SCOPE_BUILDERS[kind](uid)
 
 async def _get_customer_or_404(customer_id: str, current_user: Dict) -> Dict[str, Any]:
     query: Dict[str, Any] = {"id": customer_id}
@@ -1003,8 +1243,9 @@ async def _accessible_customer_ids(current_user: Dict) -> Optional[List[str]]:
     scope = await _customer_scope_query(current_user)
     if not scope:
         return None
-    docs = await db.customers.find(scope, {"_id": 0, "id": 1}).to_list(5000)
-    return [d["id"] for d in docs if d.get("id")]
+    # distinct is answered from the (owner, id) indexes without fetching customer documents
+    ids = await db.customers.distinct("id", scope)
+    return [cid for cid in ids if cid]
 
 def calculate_health_score(customer: Dict) -> float:
     score = 50.0
@@ -1055,13 +1296,26 @@ def determine_health_status(score: float) -> str:
         return "Critical"
 
 # Authentication Routes
+async def _insert_user(doc: Dict[str, Any]) -> None:
+    """Insert a user; the unique email index rejects duplicates, so there is no check-then-insert race."""
+    try:
+        await db.users.insert_one(doc)
+    except DuplicateKeyError:
+        raise HTTPException(status_code=400, detail="Email already registered")
+    _invalidate_team_cache()
+
+def _token_response(user_dict: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Token payload for a stored user document (without password).
+    Returned as a plain dict: the route's response_model validates it once on the way out,
+    instead of building a User here and having FastAPI validate it again.
+    """
+    roles = [_enum_value(r) for r in user_dict.get("roles") or []] or [_enum_value(user_dict.get("role") or UserRole.READ_ONLY)]
+    token = create_access_token(user_dict["id"], user_dict["email"], roles)
+    return {"access_token": token, "token_type": "bearer", "user": user_dict}
+
 @api_router.post("/auth/register", response_model=Token)
 async def register(user_data: UserCreate):
-    # Check if user exists
-    existing = await db.users.find_one({"email": user_data.email})
-    if existing:
-        raise HTTPException(status_code=400, detail="Email already registered")
-    
     # Normalize roles (new) + role (legacy)
     roles: List[str] = []
     if user_data.roles:
@@ -1085,11 +1339,11 @@ async def register(user_data: UserCreate):
         manager_id=user_data.manager_id,
     )
     
-    user_dict = user.model_dump()
-    user_dict['password'] = hash_password(user_data.password)
-    user_dict['created_at'] = user_dict['created_at'].isoformat()
+    # None fields are left out of the stored document (reads treat missing as None)
+    user_dict = user.model_dump(exclude_none=True)
+    user_dict['password'] = await hash_password(user_data.password)
     
-    await db.users.insert_one(user_dict)
+    await _insert_user(user_dict)
     
     token = create_access_token(user.id, user.email, [_enum_value(r) for r in user.roles] or [_enum_value(user.role or UserRole.READ_ONLY)])
     
@@ -1098,9 +1352,9 @@ async def register(user_data: UserCreate):
 @api_router.post("/auth/login", response_model=Token)
 async def login(credentials: UserLogin):
     try:
-        user_dict = await db.users.find_one({"email": credentials.email})
+        user_dict = await db.users.find_one({"email": credentials.email}, {"_id": 0})
         
-        if not user_dict or not verify_password(credentials.password, user_dict['password']):
+        if not user_dict or not await verify_password(credentials.password, user_dict['password']):
             raise HTTPException(status_code=401, detail="Invalid credentials")
         
         # Block login when not Active
@@ -1108,23 +1362,17 @@ async def login(credentials: UserLogin):
         if status_val != UserStatus.ACTIVE.value:
             raise HTTPException(status_code=403, detail=f"User is {status_val}")
         
-        if isinstance(user_dict.get('created_at'), str):
-            user_dict['created_at'] = datetime.fromisoformat(user_dict['created_at'])
-        if isinstance(user_dict.get('last_login_at'), str):
-            try:
-                user_dict['last_login_at'] = datetime.fromisoformat(user_dict['last_login_at'])
-            except Exception:
-                user_dict['last_login_at'] = None
-
         # Track login timestamp (live audit)
         now = datetime.now(timezone.utc)
-        await db.users.update_one({"id": user_dict["id"]}, {"$set": {"last_login_at": now.isoformat()}})
+        login_updates: Dict[str, Any] = {"last_login_at": now}
+        # Verification cost follows the stored hash: re-hash at the configured cost so a
+        # changed BCRYPT_ROUNDS applies to existing users from their next login
+        if _bcrypt_cost(user_dict['password']) != BCRYPT_ROUNDS:
+            login_updates["password"] = await hash_password(credentials.password)
+        await db.users.update_one({"id": user_dict["id"]}, {"$set": login_updates})
         user_dict["last_login_at"] = now
-    
-        user = User(**{k: v for k, v in user_dict.items() if k != 'password'})
-        token = create_access_token(user.id, user.email, [_enum_value(r) for r in user.roles] or [_enum_value(user.role or UserRole.READ_ONLY)])
-    
-        return Token(access_token=token, user=user)
+        del user_dict["password"]
+        return _token_response(user_dict)
     except HTTPException:
         raise
     except Exception as e:
@@ -1146,15 +1394,18 @@ async def accept_invite(payload: InviteAccept):
 
     exp = user_dict.get("invite_expires_at")
     if isinstance(exp, str):
+        # Legacy ISO string that migrate_dates has not converted (yet)
         try:
             exp = datetime.fromisoformat(exp)
-        except Exception:
+        except ValueError:
             exp = None
+    if exp and exp.tzinfo is None:
+        exp = exp.replace(tzinfo=timezone.utc)
     if exp and exp < datetime.now(timezone.utc):
         raise HTTPException(status_code=400, detail="Invite expired")
 
     updates: Dict[str, Any] = {
-        "password": hash_password(payload.password),
+        "password": await hash_password(payload.password),
         "status": UserStatus.ACTIVE.value,
         "invite_token": None,
         "invite_expires_at": None,
@@ -1167,32 +1418,14 @@ async def accept_invite(payload: InviteAccept):
     if not updated:
         raise HTTPException(status_code=500, detail="Invite accept failed")
 
-    # Fix timestamps types for response model
-    if isinstance(updated.get("created_at"), str):
-        try:
-            updated["created_at"] = datetime.fromisoformat(updated["created_at"])
-        except Exception:
-            pass
-
-    user = User(**updated)
-    token_jwt = create_access_token(user.id, user.email, [_enum_value(r) for r in user.roles] or [_enum_value(user.role or UserRole.READ_ONLY)])
-    return Token(access_token=token_jwt, user=user)
+    return _token_response(updated)
 
 @api_router.get("/auth/me", response_model=User)
 async def get_me(current_user: Dict = Depends(get_current_user)):
     user_dict = await db.users.find_one({"id": current_user['user_id']}, {"_id": 0, "password": 0})
     if not user_dict:
         raise HTTPException(status_code=404, detail="User not found")
-    
-    if isinstance(user_dict.get('created_at'), str):
-        user_dict['created_at'] = datetime.fromisoformat(user_dict['created_at'])
-    if isinstance(user_dict.get('last_login_at'), str):
-        try:
-            user_dict['last_login_at'] = datetime.fromisoformat(user_dict['last_login_at'])
-        except Exception:
-            user_dict['last_login_at'] = None
-    
-    return User(**user_dict)
+    return user_dict
 
 @api_router.get("/auth/permissions")
 async def get_my_permissions(current_user: Dict = Depends(get_current_user)):
@@ -1201,7 +1434,7 @@ async def get_my_permissions(current_user: Dict = Depends(get_current_user)):
     without exposing full Settings to non-admin users.
     """
     eff = await _get_effective_permissions(current_user)
-    return eff
+    return dict(eff)
 
 # User Routes
 @api_router.get("/users", response_model=List[User])
@@ -1218,50 +1451,43 @@ async def get_users(
     # - CS_LEADER: all users (read-only)
     # - AM: only team members (users where manager_id == AM) + self
     # - others: forbidden
-    allowed = {"ADMIN", "CS_OPS", "CS_LEADER", "AM"}
-    _require_roles(current_user, allowed)
+    _require_roles(current_user, ROLE_USER_DIRECTORY)
 
+    # Plain equality filters share one dict; each $or clause becomes one flat $and entry
     query: Dict[str, Any] = {}
-    roles = set(_roles(current_user))
+    or_clauses: List[Dict[str, Any]] = []
+    roles = _role_set(current_user)
     uid = _user_id(current_user)
-    if roles == {"AM"} or ("AM" in roles and not roles.intersection(ROLE_ADMINISH)):
-        query = {"$or": [{"manager_id": uid}, {"id": uid}]}
+    if "AM" in roles and roles.isdisjoint(ROLE_ADMINISH):
+        or_clauses.append({"$or": [{"manager_id": uid}, {"id": uid}]})
 
     # Optional filters (used by User Management UI)
     if role:
-        role_clause = {"$or": [{"role": role}, {"roles": {"$in": [role]}}]}
-        query = {"$and": [query, role_clause]} if query else role_clause
+        or_clauses.append({"$or": [{"role": role}, {"roles": role}]})
     if status:
-        query = {"$and": [query, {"status": status}]} if query else {"status": status}
+        query["status"] = status
     if department:
-        query = {"$and": [query, {"department": department}]} if query else {"department": department}
+        query["department"] = department
     if q:
-        rx = {"$regex": q, "$options": "i"}
-        query = {"$and": [query, {"$or": [{"name": rx}, {"email": rx}]}]} if query else {"$or": [{"name": rx}, {"email": rx}]}
-
-    users = await db.users.find(query, {"_id": 0, "password": 0}).to_list(2000)
-    for user in users:
-        if isinstance(user.get('created_at'), str):
-            user['created_at'] = datetime.fromisoformat(user['created_at'])
-        if isinstance(user.get('last_login_at'), str):
-            try:
-                user['last_login_at'] = datetime.fromisoformat(user['last_login_at'])
-            except Exception:
-                user['last_login_at'] = None
-    return users
+        # Case-insensitive substring match; the term is escaped so user input is never run as a pattern
+        rx = {"$regex": re.escape(q), "$options": "i"}
+        or_clauses.append({"$or": [{"name": rx}, {"email": rx}]})
+
+    if len(or_clauses) == 1:
+        query.update(or_clauses[0])
+    elif or_clauses:
+        query["$and"] = or_clauses
+
+    return await db.users.find(query, {"_id": 0, "password": 0}).to_list(2000)
 
 @api_router.post("/users", response_model=User)
 async def create_user(payload: InviteCreate, current_user: Dict = Depends(get_current_user)):
     # Only ADMIN/CS_OPS can create users
     _require_roles(current_user, ROLE_SETTINGS_ADMIN)
 
-    existing = await db.users.find_one({"email": payload.email})
-    if existing:
-        raise HTTPException(status_code=400, detail="Email already registered")
-
     invite_token = secrets.token_urlsafe(24) if payload.send_invite else None
     invite_expires = datetime.now(timezone.utc) + timedelta(days=7) if invite_token else None
-    creator = await db.users.find_one({"id": _user_id(current_user)}, {"_id": 0})
+    creator = await db.users.find_one({"id": _user_id(current_user)}, {"_id": 0, "name": 1})
 
     user = User(
         email=payload.email,
@@ -1277,21 +1503,16 @@ async def create_user(payload: InviteCreate, current_user: Dict = Depends(get_cu
         created_by_id=_user_id(current_user),
         created_by_name=(creator or {}).get("name"),
     )
-    doc = user.model_dump()
-    doc["password"] = hash_password(secrets.token_urlsafe(18))  # unusable random; invite must set real password
-    doc["created_at"] = doc["created_at"].isoformat()
-    doc["last_login_at"] = None
-    doc["invite_token"] = invite_token
-    doc["invite_expires_at"] = invite_expires.isoformat() if invite_expires else None
-
-    await db.users.insert_one(doc)
-
-    # Response model (no password)
-    if isinstance(doc.get("created_at"), str):
-        doc["created_at"] = datetime.fromisoformat(doc["created_at"])
-    doc.pop("password", None)
-    doc.pop("_id", None)
-    return User(**doc)
+    doc = user.model_dump(exclude_none=True)
+    doc["password"] = _unusable_password()  # invite must set real password
+    if invite_token:
+        doc["invite_token"] = invite_token
+        doc["invite_expires_at"] = invite_expires
+
+    await _insert_user(doc)
+
+    # `user` holds the same fields as the stored doc, minus password/invite data
+    return user
 
 @api_router.post("/users/create-with-invite", response_model=InviteCreateResponse)
 async def create_user_with_invite(payload: InviteCreate, current_user: Dict = Depends(get_current_user)):
@@ -1302,13 +1523,9 @@ async def create_user_with_invite(payload: InviteCreate, current_user: Dict = De
     """
     _require_roles(current_user, ROLE_SETTINGS_ADMIN)
 
-    existing = await db.users.find_one({"email": payload.email})
-    if existing:
-        raise HTTPException(status_code=400, detail="Email already registered")
-
     invite_token = secrets.token_urlsafe(24) if payload.send_invite else None
     invite_expires = datetime.now(timezone.utc) + timedelta(days=7) if invite_token else None
-    creator = await db.users.find_one({"id": _user_id(current_user)}, {"_id": 0})
+    creator = await db.users.find_one({"id": _user_id(current_user)}, {"_id": 0, "name": 1})
 
     user = User(
         email=payload.email,
@@ -1324,21 +1541,15 @@ async def create_user_with_invite(payload: InviteCreate, current_user: Dict = De
         created_by_id=_user_id(current_user),
         created_by_name=(creator or {}).get("name"),
     )
-    doc = user.model_dump()
-    doc["password"] = hash_password(secrets.token_urlsafe(18))  # unusable random; invite must set real password
-    doc["created_at"] = doc["created_at"].isoformat()
-    doc["last_login_at"] = None
-    doc["invite_token"] = invite_token
-    doc["invite_expires_at"] = invite_expires.isoformat() if invite_expires else None
-
-    await db.users.insert_one(doc)
-
-    # Response
-    if isinstance(doc.get("created_at"), str):
-        doc["created_at"] = datetime.fromisoformat(doc["created_at"])
-    doc.pop("password", None)
-    doc.pop("_id", None)
-    return InviteCreateResponse(user=User(**doc), invite_token=invite_token)
+    doc = user.model_dump(exclude_none=True)
+    doc["password"] = _unusable_password()  # invite must set real password
+    if invite_token:
+        doc["invite_token"] = invite_token
+        doc["invite_expires_at"] = invite_expires
+
+    await _insert_user(doc)
+
+    return InviteCreateResponse(user=user, invite_token=invite_token)
 
 @api_router.post("/users/{user_id}/resend-invite")
 async def resend_invite(user_id: str, current_user: Dict = Depends(get_current_user)):
@@ -1351,7 +1562,7 @@ async def resend_invite(user_id: str, current_user: Dict = Depends(get_current_u
     invite_expires = datetime.now(timezone.utc) + timedelta(days=7)
     await db.users.update_one(
         {"id": user_id},
-        {"$set": {"invite_token": invite_token, "invite_expires_at": invite_expires.isoformat(), "status": UserStatus.INACTIVE.value}},
+        {"$set": {"invite_token": invite_token, "invite_expires_at": invite_expires, "status": UserStatus.INACTIVE.value}},
     )
     return {"message": "Invite generated", "invite_token": invite_token}
 
@@ -1361,7 +1572,7 @@ class PasswordReset(BaseModel):
 @api_router.put("/users/{user_id}", response_model=User)
 async def update_user(user_id: str, user_update: UserUpdateAdmin, current_user: Dict = Depends(get_current_user)):
     _require_roles(current_user, ROLE_SETTINGS_ADMIN)
-    update = {k: v for k, v in user_update.model_dump().items() if v is not None}
+    update = user_update.model_dump(exclude_none=True)
     if not update:
         raise HTTPException(status_code=400, detail="No fields to update")
 
@@ -1371,19 +1582,16 @@ async def update_user(user_id: str, user_update: UserUpdateAdmin, current_user:
     if "status" in update and isinstance(update["status"], Enum):
         update["status"] = update["status"].value
 
-    await db.users.update_one({"id": user_id}, {"$set": update})
-    user_dict = await db.users.find_one({"id": user_id}, {"_id": 0, "password": 0})
+    user_dict = await db.users.find_one_and_update(
+        {"id": user_id},
+        {"$set": update},
+        projection={"_id": 0, "password": 0},
+        return_document=ReturnDocument.AFTER,
+    )
+    _invalidate_team_cache()
     if not user_dict:
         raise HTTPException(status_code=404, detail="User not found")
-
-    if isinstance(user_dict.get("created_at"), str):
-        user_dict["created_at"] = datetime.fromisoformat(user_dict["created_at"])
-    if isinstance(user_dict.get("last_login_at"), str):
-        try:
-            user_dict["last_login_at"] = datetime.fromisoformat(user_dict["last_login_at"])
-        except Exception:
-            user_dict["last_login_at"] = None
-    return User(**user_dict)
+    return user_dict
 
 @api_router.delete("/users/{user_id}")
 async def delete_user(user_id: str, current_user: Dict = Depends(get_current_user)):
@@ -1392,6 +1600,7 @@ async def delete_user(user_id: str, current_user: Dict = Depends(get_current_use
     if user_id == current_user.get("user_id"):
         raise HTTPException(status_code=400, detail="Cannot delete your own user")
     result = await db.users.delete_one({"id": user_id})
+    _invalidate_team_cache()
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="User not found")
     return {"message": "User deleted successfully"}
@@ -1401,7 +1610,7 @@ async def reset_password(user_id: str, payload: PasswordReset, current_user: Dic
     _require_roles(current_user, ROLE_SETTINGS_ADMIN)
     if len(payload.password) < 6:
         raise HTTPException(status_code=400, detail="Password must be at least 6 characters")
-    result = await db.users.update_one({"id": user_id}, {"$set": {"password": hash_password(payload.password)}})
+    result = await db.users.update_one({"id": user_id}, {"$set": {"password": await hash_password(payload.password)}})
     if result.matched_count == 0:
         raise HTTPException(status_code=404, detail="User not found")
     return {"message": "Password reset successfully"}
@@ -1421,8 +1630,21 @@ async def update_settings(payload: SettingsUpdate, current_user: Dict = Depends(
     merged = {**existing, **update_dict}
     await db.settings.update_one({"id": "global"}, {"$set": merged}, upsert=True)
     stored = await db.settings.find_one({"id": "global"}, {"_id": 0})
+    _SettingsCache.store(stored)
     return SettingsDoc(**stored)
 
+async def _update_settings_doc(update: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Apply `update` to the global settings doc and refresh the cache from the result."""
+    stored = await db.settings.find_one_and_update(
+        {"id": "global"},
+        update,
+        projection={"_id": 0},
+        return_document=ReturnDocument.AFTER,
+    )
+    if stored:
+        _SettingsCache.store(stored)
+    return stored
+
 @api_router.post("/settings/tags")
 async def add_tag(tag: Dict[str, str], current_user: Dict = Depends(get_current_user)):
     _require_roles(current_user, ROLE_SETTINGS_ADMIN)
@@ -1430,14 +1652,14 @@ async def add_tag(tag: Dict[str, str], current_user: Dict = Depends(get_current_
     if not value:
         raise HTTPException(status_code=400, detail="tag is required")
     await _ensure_settings()
-    await db.settings.update_one({"id": "global"}, {"$addToSet": {"tags": value}})
+    await _update_settings_doc({"$addToSet": {"tags": value}})
     return {"message": "Tag added", "tag": value}
 
 @api_router.delete("/settings/tags/{tag_value}")
 async def remove_tag(tag_value: str, current_user: Dict = Depends(get_current_user)):
     _require_roles(current_user, ROLE_SETTINGS_ADMIN)
     await _ensure_settings()
-    await db.settings.update_one({"id": "global"}, {"$pull": {"tags": tag_value}})
+    await _update_settings_doc({"$pull": {"tags": tag_value}})
     return {"message": "Tag removed", "tag": tag_value}
 
 # Export / Dump Routes
@@ -1445,14 +1667,154 @@ def _csv_value(v: Any) -> str:
     if v is None:
         return ""
     if isinstance(v, (list, dict)):
-        return json.dumps(v, ensure_ascii=False)
+        return orjson.dumps(v).decode('utf-8')
+    if isinstance(v, datetime):
+        return v.isoformat()
     return str(v)
 
-async def _export_collection(collection_name: str, query: Dict[str, Any], exclude_fields: Optional[Dict[str, int]] = None) -> List[Dict[str, Any]]:
+EXPORT_MAX_ROWS = 50000
+EXPORT_BATCH_SIZE = 500  # cursor batch size and rows per streamed chunk
+BULK_INSERT_BATCH_SIZE = 1000
+
+async def _csv_stream(rows, fieldnames: List[str]):
+    """Yield the CSV export in encoded chunks of EXPORT_BATCH_SIZE rows as they arrive from `rows`."""
+    buf = io.StringIO()
+    writer = csv.DictWriter(buf, fieldnames=fieldnames)
+    writer.writeheader()
+    batch: List[Dict[str, str]] = []
+
+    def flush() -> bytes:
+        # One writerows call per batch amortizes the writer overhead across its rows
+        writer.writerows(batch)
+        batch.clear()
+        chunk = buf.getvalue().encode('utf-8')
+        buf.seek(0)
+        buf.truncate(0)
+        return chunk
+
+    async for r in rows:
+        batch.append({k: _csv_value(r.get(k)) for k in fieldnames})
+        if len(batch) == EXPORT_BATCH_SIZE:
+            yield flush()
+    # Final partial batch (or just the header for an empty export)
+    yield flush()
+
+async def _json_stream(rows):
+    """Yield a JSON array of `rows`, EXPORT_BATCH_SIZE documents per chunk."""
+    yield b"["
+    sep = b""
+    batch: List[bytes] = []
+    async for r in rows:
+        batch.append(orjson.dumps(r))
+        if len(batch) == EXPORT_BATCH_SIZE:
+            yield sep + b",".join(batch)
+            sep = b","
+            batch = []
+    if batch:
+        yield sep + b",".join(batch)
+    yield b"]"
+
+def _export_cursor(collection_name: str, query: Dict[str, Any], exclude_fields: Optional[Dict[str, int]] = None):
     projection = {"_id": 0}
     if exclude_fields:
         projection.update(exclude_fields)
-    return await db[collection_name].find(query, projection).to_list(50000)
+    # Sorted on _id so the capped row set is deterministic (and matches _export_fieldnames)
+    return db[collection_name].find(query, projection).sort("_id", 1).limit(EXPORT_MAX_ROWS).batch_size(EXPORT_BATCH_SIZE)
+
+async def _export_collection(collection_name: str, query: Dict[str, Any], exclude_fields: Optional[Dict[str, int]] = None) -> List[Dict[str, Any]]:
+    return await _export_cursor(collection_name, query, exclude_fields).to_list(EXPORT_MAX_ROWS)
+
+async def _export_fieldnames(collection_name: str, query: Dict[str, Any], exclude_fields: Optional[Dict[str, int]] = None) -> List[str]:
+    """
+    Top-level field names across the export, in first-seen order (the CSV header).
+    Covers the same documents as _export_cursor (same sort and limit); only each document's
+    key list is sent back, so the rows themselves can be streamed afterwards.
+    """
+    skip = {"_id", *(exclude_fields or {})}
+    pipeline = [
+        {"$match": query},
+        {"$sort": {"_id": 1}},
+        {"$limit": EXPORT_MAX_ROWS},
+        {"$project": {"_id": 0, "keys": {"$map": {"input": {"$objectToArray": "$$ROOT"}, "in": "$$this.k"}}}},
+    ]
+    # dict as an insertion-ordered set: one hashed update per document instead of list scans
+    seen: Dict[str, None] = {}
+    async for doc in db[collection_name].aggregate(pipeline, batchSize=EXPORT_BATCH_SIZE):
+        seen.update(dict.fromkeys(doc["keys"]))
+    return [k for k in seen if k not in skip]
+
+async def _portfolio_stats() -> Dict[str, Any]:
+    """Customer, risk and opportunity totals for the dashboard and the full dump, summed in MongoDB."""
+    health_groups, risk_totals, open_pipeline = await asyncio.gather(
+        db.customers.aggregate([
+            {"$group": {"_id": "$health_status", "count": {"$sum": 1}, "arr": {"$sum": "$arr"}}},
+        ]).to_list(None),
+        db.risks.aggregate([
+            {"$group": {
+                "_id": None,
+                "open": {"$sum": {"$cond": [{"$eq": ["$status", "Open"]}, 1, 0]}},
+                "critical": {"$sum": {"$cond": [{"$eq": ["$severity", "Critical"]}, 1, 0]}},
+            }},
+        ]).to_list(1),
+        db.opportunities.aggregate([
+            {"$match": {"stage": {"$ne": "Closed Won"}}},
+            {"$group": {"_id": None, "count": {"$sum": 1}, "value": {"$sum": "$value"}}},
+        ]).to_list(1),
+    )
+    by_health = {g["_id"]: g["count"] for g in health_groups}
+    risks = risk_totals[0] if risk_totals else {}
+    pipeline = open_pipeline[0] if open_pipeline else {}
+    return {
+        "total_customers": sum(g["count"] for g in health_groups),
+        "total_arr": sum(g["arr"] for g in health_groups),
+        "healthy_customers": by_health.get("Healthy", 0),
+        "at_risk_customers": by_health.get("At Risk", 0),
+        "critical_customers": by_health.get("Critical", 0),
+        "open_risks": risks.get("open", 0),
+        "critical_risks": risks.get("critical", 0),
+        "active_opportunities": pipeline.get("count", 0),
+        "pipeline_value": pipeline.get("value", 0),
+    }
+
+# Registered before /exports/{entity}, which would otherwise match "dump" as an entity
+@api_router.get("/exports/dump")
+async def export_dump(current_user: Dict = Depends(get_current_user)):
+    # Permission check
+    perms = await _user_permissions(current_user)
+    if not perms.get("modules", {}).get("exports", {}).get("enabled"):
+        raise HTTPException(status_code=403, detail="Exports module not accessible")
+    
+    # Full JSON dump across collections + computed stats
+    # Independent reads: fetch all collections (and the aggregated stats) concurrently
+    stats, users, customers, activities, risks, opportunities, tasks, datalabs_reports, documents = await asyncio.gather(
+        _portfolio_stats(),
+        _export_collection("users", {}, exclude_fields={"password": 0}),
+        _export_collection("customers", {}),
+        _export_collection("activities", {}),
+        _export_collection("risks", {}),
+        _export_collection("opportunities", {}),
+        _export_collection("tasks", {}),
+        _export_collection("datalabs_reports", {}),
+        _export_collection("documents", {}),
+    )
+
+    dump = {
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "stats": stats,
+        "users": users,
+        "customers": customers,
+        "activities": activities,
+        "risks": risks,
+        "opportunities": opportunities,
+        "tasks": tasks,
+        "datalabs_reports": datalabs_reports,
+        "documents": documents,
+    }
+
+    return ORJSONResponse(
+        content=dump,
+        headers={"Content-Disposition": 'attachment; filename="elivate-dump.json"'},
+    )
 
 @api_router.get("/exports/{entity}")
 async def export_entity(
@@ -1487,94 +1849,26 @@ async def export_entity(
         else:
             query["customer_id"] = customer_id
 
-    rows = await _export_collection(collection_name, query, exclude_fields=exclude)
-
     filename_base = entity.replace("/", "-")
     if customer_id:
         filename_base += f"-{customer_id}"
 
+    # Rows are streamed from the cursor, so memory stays at one batch regardless of export size
     if format == "json":
-        return JSONResponse(
-            content=rows,
+        return StreamingResponse(
+            _json_stream(_export_cursor(collection_name, query, exclude)),
+            media_type="application/json",
             headers={"Content-Disposition": f'attachment; filename="{filename_base}.json"'},
         )
 
-    # CSV
-    output = io.StringIO()
-    fieldnames: List[str] = []
-    for r in rows:
-        for k in r.keys():
-            if k not in fieldnames:
-                fieldnames.append(k)
-
-    writer = csv.DictWriter(output, fieldnames=fieldnames or ["id"])
-    writer.writeheader()
-    for r in rows:
-        writer.writerow({k: _csv_value(r.get(k)) for k in (fieldnames or ["id"])})
-
-    output.seek(0)
+    # CSV (header needs every field name up front: collected with a keys-only pass over the same documents)
+    fieldnames = await _export_fieldnames(collection_name, query, exclude)
     return StreamingResponse(
-        iter([output.getvalue()]),
+        _csv_stream(_export_cursor(collection_name, query, exclude), fieldnames or ["id"]),
         media_type="text/csv",
         headers={"Content-Disposition": f'attachment; filename="{filename_base}.csv"'},
     )
 
-@api_router.get("/exports/dump")
-async def export_dump(current_user: Dict = Depends(get_current_user)):
-    # Permission check
-    perms = await _user_permissions(current_user)
-    if not perms.get("modules", {}).get("exports", {}).get("enabled"):
-        raise HTTPException(status_code=403, detail="Exports module not accessible")
-    
-    # Full JSON dump across collections + computed stats
-    users = await _export_collection("users", {}, exclude_fields={"password": 0})
-    customers = await _export_collection("customers", {})
-    activities = await _export_collection("activities", {})
-    risks = await _export_collection("risks", {})
-    opportunities = await _export_collection("opportunities", {})
-    tasks = await _export_collection("tasks", {})
-    datalabs_reports = await _export_collection("datalabs_reports", {})
-    documents = await _export_collection("documents", {})
-
-    # reuse existing stats endpoint logic inline by counting
-    total_customers = len(customers)
-    total_arr = sum((c.get("arr") or 0) for c in customers)
-    healthy_count = sum(1 for c in customers if c.get("health_status") == "Healthy")
-    at_risk_count = sum(1 for c in customers if c.get("health_status") == "At Risk")
-    critical_count = sum(1 for c in customers if c.get("health_status") == "Critical")
-    open_risks = sum(1 for r in risks if r.get("status") == "Open")
-    critical_risks = sum(1 for r in risks if r.get("severity") == "Critical")
-    active_opportunities = sum(1 for o in opportunities if o.get("stage") != "Closed Won")
-    pipeline_value = sum((o.get("value") or 0) for o in opportunities if o.get("stage") != "Closed Won")
-
-    dump = {
-        "generated_at": datetime.now(timezone.utc).isoformat(),
-        "stats": {
-            "total_customers": total_customers,
-            "total_arr": total_arr,
-            "healthy_customers": healthy_count,
-            "at_risk_customers": at_risk_count,
-            "critical_customers": critical_count,
-            "open_risks": open_risks,
-            "critical_risks": critical_risks,
-            "active_opportunities": active_opportunities,
-            "pipeline_value": pipeline_value,
-        },
-        "users": users,
-        "customers": customers,
-        "activities": activities,
-        "risks": risks,
-        "opportunities": opportunities,
-        "tasks": tasks,
-        "datalabs_reports": datalabs_reports,
-        "documents": documents,
-    }
-
-    return JSONResponse(
-        content=dump,
-        headers={"Content-Disposition": 'attachment; filename="elivate-dump.json"'},
-    )
-
 # Customer Routes
 @api_router.post("/customers", response_model=Customer)
 async def create_customer(customer_data: CustomerCreate, current_user: Dict = Depends(get_current_user)):
@@ -1831,16 +2125,60 @@ async def bulk_upload_customers(file: UploadFile = File(...), current_user: Dict
     if not file.filename.endswith('.csv'):
         raise HTTPException(status_code=400, detail="Only CSV files are accepted")
     
+    # Decode and parse the whole file (in a worker thread) before inserting anything, so a bad byte
+    # or malformed line rejects the upload instead of leaving it partly imported
     content = await file.read()
-    decoded = content.decode('utf-8')
-    reader = csv.DictReader(io.StringIO(decoded))
+
+    def parse_rows() -> List[Dict[str, str]]:
+        return list(csv.DictReader(io.StringIO(content.decode('utf-8'))))
+
+    try:
+        rows = await asyncio.to_thread(parse_rows)
+    except UnicodeDecodeError as e:
+        raise HTTPException(status_code=400, detail=f"File is not valid UTF-8 (byte {e.start})")
+    except csv.Error as e:
+        raise HTTPException(status_code=400, detail=f"Malformed CSV: {e}")
     
     success_count = 0
     error_count = 0
     errors = []
     total_rows = 0
-    
-    for row_num, row in enumerate(reader, start=2):  # Start at 2 to account for header
+
+    # Rows are inserted BULK_INSERT_BATCH_SIZE at a time; `seen` catches duplicates within the file
+    # and the unique company_name index catches customers that already exist
+    pending: List[Dict[str, Any]] = []
+    pending_rows: List[int] = []
+    seen: set[str] = set()
+    # csm_email -> (csm_owner_id, csm_owner_name, am_owner_id, am_owner_name), looked up once per file
+    owners: Dict[str, Tuple[Optional[str], Optional[str], Optional[str], Optional[str]]] = {}
+
+    async def flush_pending():
+        nonlocal success_count, error_count
+        if not pending:
+            return
+        try:
+            await db.customers.insert_many(pending, ordered=False)
+            success_count += len(pending)
+        except BulkWriteError as bwe:
+            write_errors = bwe.details.get("writeErrors", [])
+            success_count += len(pending) - len(write_errors)
+            for we in write_errors:
+                if we.get("code") == 11000:
+                    message = f"Customer '{pending[we['index']]['company_name']}' already exists"
+                else:
+                    message = we.get("errmsg", "Insert failed")
+                errors.append({"row": pending_rows[we["index"]], "error": message})
+                error_count += 1
+        except Exception as e:
+            # Outcome of the batch is unknown (e.g. connection lost mid-write): report every row in it
+            for row_num in pending_rows:
+                errors.append({"row": row_num, "error": f"Insert failed: {e}"})
+            error_count += len(pending_rows)
+        finally:
+            pending.clear()
+            pending_rows.clear()
+    
+    for row_num, row in enumerate(rows, start=2):  # Start at 2 to account for header
         total_rows += 1
         try:
             # Validate required field
@@ -1849,32 +2187,35 @@ async def bulk_upload_customers(file: UploadFile = File(...), current_user: Dict
                 error_count += 1
                 continue
             
-            # Check for existing customer
-            existing = await db.customers.find_one({"company_name": row['company_name']})
-            if existing:
+            # Duplicate within the file (existing customers are rejected by the unique index on insert)
+            if row['company_name'] in seen:
                 errors.append({"row": row_num, "error": f"Customer '{row['company_name']}' already exists"})
                 error_count += 1
                 continue
+
+            plan_type = row.get('plan_type') or PlanType.LICENSE.value
+            if plan_type not in _PLAN_TYPE_VALUES:
+                errors.append({"row": row_num, "error": f"Invalid plan_type '{plan_type}'"})
+                error_count += 1
+                continue
             
-            # Get CSM owner ID from email if provided
-            csm_owner_id = None
-            csm_owner_name = None
-            if row.get('csm_email'):
-                csm = await db.users.find_one({"email": row['csm_email']}, {"_id": 0})
-                if csm:
-                    csm_owner_id = csm['id']
-                    csm_owner_name = csm['name']
-            
-            # Auto-map AM owner from mapped CSM->AM relationship if available
-            am_owner_id = None
-            am_owner_name = None
-            if csm_owner_id:
-                csm_user = await db.users.find_one({"id": csm_owner_id}, {"_id": 0, "manager_id": 1})
-                if csm_user and csm_user.get("manager_id"):
-                    am_owner_id = csm_user["manager_id"]
-                    am_user = await db.users.find_one({"id": am_owner_id}, {"_id": 0, "name": 1})
-                    if am_user and am_user.get("name"):
-                        am_owner_name = am_user["name"]
+            # Get CSM owner ID from email if provided, and auto-map the AM owner from the
+            # mapped CSM->AM relationship if available
+            csm_owner_id = csm_owner_name = am_owner_id = am_owner_name = None
+            csm_email = row.get('csm_email')
+            if csm_email:
+                if csm_email not in owners:
+                    csm = await db.users.find_one({"email": csm_email}, {"_id": 0, "id": 1, "name": 1, "manager_id": 1})
+                    owner = (None, None, None, None)
+                    if csm:
+                        manager_id = csm.get("manager_id")
+                        manager_name = None
+                        if manager_id:
+                            am_user = await db.users.find_one({"id": manager_id}, {"_id": 0, "name": 1})
+                            manager_name = (am_user or {}).get("name") or None
+                        owner = (csm['id'], csm['name'], manager_id or None, manager_name)
+                    owners[csm_email] = owner
+                csm_owner_id, csm_owner_name, am_owner_id, am_owner_name = owners[csm_email]
             
             # Create customer
             customer_dict = {
@@ -1883,7 +2224,7 @@ async def bulk_upload_customers(file: UploadFile = File(...), current_user: Dict
                 "website": row.get('website', ''),
                 "industry": row.get('industry', ''),
                 "region": row.get('region', ''),
-                "plan_type": row.get('plan_type', 'License'),
+                "plan_type": plan_type,
                 "arr": float(row['arr']) if row.get('arr') else 0,
                 "renewal_date": row.get('renewal_date', ''),
                 "onboarding_status": "Not Started",
@@ -1902,12 +2243,18 @@ async def bulk_upload_customers(file: UploadFile = File(...), current_user: Dict
                 "updated_at": datetime.now(timezone.utc).isoformat()
             }
             
-            await db.customers.insert_one(customer_dict)
-            success_count += 1
+            seen.add(row['company_name'])
+            pending.append(customer_dict)
+            pending_rows.append(row_num)
+            if len(pending) >= BULK_INSERT_BATCH_SIZE:
+                await flush_pending()
             
         except Exception as e:
             errors.append({"row": row_num, "error": str(e)})
             error_count += 1
+
+    await flush_pending()
+    errors.sort(key=lambda e: e["row"])
     
     return BulkUploadResult(
         success_count=success_count,
@@ -2531,23 +2878,7 @@ async def delete_datalabs_report(report_id: str, current_user: Dict = Depends(ge
 async def get_dashboard_stats(current_user: Dict = Depends(get_current_user)):
     try:
         await _check_db_connection()
-        total_customers = await db.customers.count_documents({})
-        total_arr = await db.customers.aggregate([
-            {"$group": {"_id": None, "total": {"$sum": "$arr"}}}
-        ]).to_list(1)
-        
-        healthy_count = await db.customers.count_documents({"health_status": "Healthy"})
-        at_risk_count = await db.customers.count_documents({"health_status": "At Risk"})
-        critical_count = await db.customers.count_documents({"health_status": "Critical"})
-        
-        open_risks = await db.risks.count_documents({"status": "Open"})
-        critical_risks = await db.risks.count_documents({"severity": "Critical"})
-        
-        active_opportunities = await db.opportunities.count_documents({"stage": {"$ne": "Closed Won"}})
-        pipeline_value = await db.opportunities.aggregate([
-            {"$match": {"stage": {"$ne": "Closed Won"}}},
-            {"$group": {"_id": None, "total": {"$sum": "$value"}}}
-        ]).to_list(1)
+        stats = await _portfolio_stats()
         
         # Task stats
         perms = await _user_permissions(current_user)
@@ -2590,15 +2921,7 @@ async def get_dashboard_stats(current_user: Dict = Depends(get_current_user)):
         tasks_due_today = await db.tasks.count_documents(q_due_today)
         
         return {
-            "total_customers": total_customers,
-            "total_arr": total_arr[0]['total'] if total_arr and total_arr[0].get('total') else 0,
-            "healthy_customers": healthy_count,
-            "at_risk_customers": at_risk_count,
-            "critical_customers": critical_count,
-            "open_risks": open_risks,
-            "critical_risks": critical_risks,
-            "active_opportunities": active_opportunities,
-            "pipeline_value": pipeline_value[0]['total'] if pipeline_value and pipeline_value[0].get('total') else 0,
+            **stats,
             "my_tasks": active_tasks_count,
             "overdue_tasks": overdue_tasks,
             "tasks_due_today": tasks_due_today
@@ -2939,8 +3262,7 @@ async def create_notification(
 ):
     """Create a new notification (admin/system only)"""
     # Only admins or system can create notifications
-    roles = _roles(current_user)
-    if not roles.intersection({'ADMIN', 'CS_OPS'}):
+    if ROLE_SETTINGS_ADMIN.isdisjoint(_role_set(current_user)):
         raise HTTPException(status_code=403, detail="Forbidden")
     
     notif_dict = notification.model_dump()
@@ -3010,8 +3332,14 @@ async def startup_db():
     global db, client
     try:
         if db is not None:
+            # Open the pool now rather than on the first request
+            await db.command("ping")
             await ensure_schema(db)
             logger.info("Database schema initialized successfully")
+            # Load settings in the background so the first request doesn't pay for it
+            _SettingsCache.warmup = asyncio.create_task(_ensure_settings())
+            if _SettingsCache.refresher is None:
+                _SettingsCache.refresher = asyncio.create_task(_settings_refresher())
         else:
             logger.warning("Database connection not available on startup")
     except Exception as e:
@@ -3019,5 +3347,10 @@ async def startup_db():
 
 @app.on_event("shutdown")
 async def shutdown_db_client():
+    for task in (_SettingsCache.warmup, _SettingsCache.refresher):
+        if task is not None:
+            task.cancel()
+    _SettingsCache.warmup = _SettingsCache.refresher = None
+    _BCRYPT_EXECUTOR.shutdown(wait=False)
     if client:
         client.close()
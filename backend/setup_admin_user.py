@@ -8,7 +8,7 @@ import asyncio
 import argparse
 import bcrypt
 import certifi
-from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import AsyncMongoClient
 from dotenv import load_dotenv
 from datetime import datetime, timezone
 
@@ -35,7 +35,7 @@ async def setup_admin():
     print(f"📊 Connecting to database: {DB_NAME}")
     print(f"   MongoDB URL: {MONGO_URL[:50]}...")
     
-    client = AsyncIOMotorClient(
+    client = AsyncMongoClient(
         MONGO_URL,
         tlsCAFile=certifi.where(),
         tls=True,
@@ -99,7 +99,7 @@ async def setup_admin():
         import traceback
         traceback.print_exc()
     finally:
-        client.close()
+        await client.close()
 
 if __name__ == "__main__":
     asyncio.run(setup_admin())